@@ -1,7 +1,7 @@
 import discord
 from discord.ext import commands
 import config
-from database import init_db
+from database import init_db, close_conn, checkpoint_wal_loop
 from logger import logger
 import asyncio
 import os
@@ -20,6 +20,7 @@ COMMAND_PREFIX = "!"
 COG_FOLDER = "cogs"
 
 bot = commands.Bot(command_prefix=COMMAND_PREFIX, intents=intents)
+_checkpoint_task = None  # started once; on_ready can fire again after reconnects
 
 
 # ==========================================================
@@ -54,6 +55,9 @@ async def on_ready():
     try:
         await init_db()
         logger.info("Database initialized.")
+        global _checkpoint_task
+        if _checkpoint_task is None:
+            _checkpoint_task = bot.loop.create_task(checkpoint_wal_loop())
     except Exception as e:
         logger.error(f"init_db() failed: {e}")
 
@@ -169,6 +173,9 @@ async def reload(ctx):
 async def shutdown():
     logger.warning("Bot shutting down...")
     await bot.close()
+    if _checkpoint_task is not None:
+        _checkpoint_task.cancel()
+    await close_conn()
 
 
 # ==========================================================
@@ -39,7 +39,7 @@ class PersistentGiveawayView(discord.ui.View):
         user = interaction.user
         if user.bot:
             await interaction.response.send_message("Bots cannot join giveaways.", ephemeral=True)
-            logger.debug(f"[GIVEAWAY] bot prevented from joining giveaway {self.giveaway_id} user={user.id}")
+            logger.debug("[GIVEAWAY] bot prevented from joining giveaway %s user=%s", self.giveaway_id, user.id)
             return
 
         try:
@@ -57,7 +57,7 @@ class PersistentGiveawayView(discord.ui.View):
                 urow = await cur.fetchone()
                 if not urow:
                     await interaction.response.send_message("You must chat a bit first to join giveaways.", ephemeral=True)
-                    logger.debug(f"[GIVEAWAY] join blocked - user not in users table: {user.id}")
+                    logger.debug("[GIVEAWAY] join blocked - user not in users table: %s", user.id)
                     return
 
                 user_messages, user_level = int(urow[0]), int(urow[1])
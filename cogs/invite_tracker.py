@@ -15,7 +15,7 @@ Features:
 import discord
 from discord.ext import commands
 from logger import logger
-from database import add_user, get_user, update_user
+from database import get_or_create_user, update_user
 import aiosqlite
 from typing import Optional
 
@@ -34,14 +34,9 @@ class InviteTracker(commands.Cog):
         logger.info("[INVITE] Invite Tracker initialized.")
 
     # ---------------- DATABASE HELPERS ----------------
-    async def _ensure_user(self, user_id: str):
-        """Ensure user has a row in the DB."""
-        await add_user(user_id)
-
     async def _get_invites(self, user_id: str) -> int:
         """Return number of invites for a user."""
-        await self._ensure_user(user_id)
-        row = await get_user(user_id)
+        row = await get_or_create_user(user_id)
         if row:
             _, _, _, _, _, invites = (*row, 0)  # add default if missing
             return invites
@@ -1,20 +1,22 @@
 # cogs/level.py
 import discord
 from discord.ext import commands
+import asyncio
 import time
 import math
 import io
-import aiosqlite
-from typing import Optional
+from typing import Dict, List, Optional
 from PIL import Image, ImageDraw, ImageFont
 
-from database import DB_PATH, add_user, get_user, update_user
+from database import transaction, get_user, claim_daily, add_xp_batch, get_leaderboard_page
 from logger import logger
 
 # ---------------- CONFIG ----------------
 COMMAND_PREFIX = "!"
 XP_PER_MESSAGE = 6
 MESSAGE_COOLDOWN = 3  # seconds
+XP_FLUSH_INTERVAL = 5  # seconds between batched XP writes
+XP_FLUSH_MAX_PENDING = 100  # flush early once this many users are pending
 LEVEL_UP_CHANNEL_ID = 1305771250693705818
 LEVEL_UP_GIF = "https://media2.giphy.com/media/v1.Y2lkPTc5MGI3NjExcWo5eTJ3bW5ocTM0YWZhZzVtbXdyNnJ0YjM1bHhmcXUzMWk1bzNsMyZlcD12MV9pbnRlcm5hbF9naWZfYnlfaWQmY3Q9Zw/tMH2lSNTy0MX2AYCoz/giphy.gif"
 
@@ -40,7 +42,7 @@ def compute_daily_aura(streak: int) -> int:
 # ---------------- util functions ----------------
 def xp_to_level(xp: int) -> int:
     try:
-        return int(math.sqrt(xp // 10)) + 1
+        return math.isqrt(xp // 10) + 1
     except Exception:
         return 1
 
@@ -130,15 +132,27 @@ class LevelCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self._msg_cd = {}          # message XP cooldowns
-        self._profile_cache = {}   # used for Profile cog
+        # bot's static prefix(es) as a tuple for one startswith() call; callable prefixes fall back to ours
+        prefix = bot.command_prefix
+        self._prefixes = (prefix,) if isinstance(prefix, str) else (COMMAND_PREFIX,) if callable(prefix) else tuple(prefix)
+        self._pending: Dict[str, List] = {}  # uid -> [xp, messages, last channel]
+        self._flush_now = asyncio.Event()
+        self._closing = False
+        self._flush_task = self.bot.loop.create_task(self._xp_flush_loop())
         logger.info("LevelCog loaded.")
 
+    def _invalidate_profile(self, uid: str):
+        """Drop the Profile cog's cached embed for uid after its stats change."""
+        profile = self.bot.get_cog("Profile")
+        if profile:
+            profile.invalidate(uid)
+
     # ---- award XP per message ----
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
         if message.author.bot or not message.guild:
             return
-        if message.content.startswith(COMMAND_PREFIX):
+        if message.content.startswith(self._prefixes):
             return
 
         uid = str(message.author.id)
@@ -148,65 +162,93 @@ class LevelCog(commands.Cog):
             return
         self._msg_cd[uid] = now
 
-        await add_user(uid)
-        before = await get_user(uid)
-        before_xp = int(before[1]) if before and before[1] is not None else 0
-        before_level = int(before[2]) if before and before[2] is not None else xp_to_level(before_xp)
-
-        await update_user(uid, xp_gain=XP_PER_MESSAGE)
-
-        after = await get_user(uid)
-        after_xp = int(after[1]) if after and after[1] is not None else before_xp
-        after_level = int(after[2]) if after and after[2] is not None else xp_to_level(after_xp)
-
-        # clear profile cache
-        self._profile_cache.pop(uid, None)
+        # buffered; written by _flush_xp in one transaction
+        entry = self._pending.get(uid)
+        if entry is None:
+            self._pending[uid] = [XP_PER_MESSAGE, 1, message.channel]
+        else:
+            entry[0] += XP_PER_MESSAGE
+            entry[1] += 1
+            entry[2] = message.channel
+        if len(self._pending) >= XP_FLUSH_MAX_PENDING:
+            self._flush_now.set()
+
+    # ---- batched XP writes ----
+    async def _xp_flush_loop(self):
+        try:
+            # cog_unload sets _closing and wakes us, so a flush is never cut off mid-transaction
+            while not self._closing:
+                try:
+                    await asyncio.wait_for(self._flush_now.wait(), timeout=XP_FLUSH_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                self._flush_now.clear()
+                await self._flush_xp()
+        except asyncio.CancelledError:
+            logger.info("LevelCog XP flush loop cancelled.")
+            raise
+
+    def _requeue(self, pending: Dict[str, List]):
+        """Merge an unwritten batch back into _pending so the XP is not lost."""
+        for uid, (xp, msgs, channel) in pending.items():
+            entry = self._pending.setdefault(uid, [0, 0, channel])
+            entry[0] += xp
+            entry[1] += msgs
+
+    async def _flush_xp(self):
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        try:
+            level_ups = await add_xp_batch((uid, xp, msgs) for uid, (xp, msgs, _) in pending.items())
+        except asyncio.CancelledError:
+            # transaction() rolled back; keep the batch for the next flush
+            self._requeue(pending)
+            raise
+        except Exception:
+            logger.exception("Failed to flush pending XP; will retry.")
+            self._requeue(pending)
+            return
 
-        if after_level > before_level:
-            guild = message.guild
-            channel = guild.get_channel(LEVEL_UP_CHANNEL_ID) if LEVEL_UP_CHANNEL_ID else None
-            embed = discord.Embed(title="⚔ LEVEL UP!",
-                                  description=f"<@{uid}> has reached **Level {after_level}**!",
-                                  color=discord.Color.gold())
-            embed.set_image(url=LEVEL_UP_GIF)
-            embed.set_footer(text="Your journey continues...")
-            try:
-                if channel:
-                    await channel.send(embed=embed)
-                else:
-                    await message.channel.send(embed=embed)
-            except Exception:
-                logger.exception("Failed to send level-up embed.")
+        for uid in pending:
+            self._invalidate_profile(uid)
+        for uid, _, new_level in level_ups:
+            await self._announce_level_up(pending[uid][2], uid, new_level)
+
+    async def _announce_level_up(self, source_channel: discord.abc.Messageable, uid: str, level: int):
+        guild = source_channel.guild
+        channel = guild.get_channel(LEVEL_UP_CHANNEL_ID) if LEVEL_UP_CHANNEL_ID else None
+        embed = discord.Embed(title="⚔ LEVEL UP!",
+                              description=f"<@{uid}> has reached **Level {level}**!",
+                              color=discord.Color.gold())
+        embed.set_image(url=LEVEL_UP_GIF)
+        embed.set_footer(text="Your journey continues...")
+        try:
+            if channel:
+                await channel.send(embed=embed)
+            else:
+                await source_channel.send(embed=embed)
+        except Exception:
+            logger.exception("Failed to send level-up embed.")
 
     # ---- daily command ----
     @commands.command(name="daily")
     async def daily(self, ctx: commands.Context):
         uid = str(ctx.author.id)
-        now = int(time.time())
-
-        await add_user(uid)
-        row = await get_user(uid)
-        streak = int(row[5]) if len(row) > 5 and row[5] is not None else 0
-        last_claim = int(row[6]) if len(row) > 6 and row[6] is not None else 0
-
-        if now - last_claim < 86400:
-            remaining = 86400 - (now - last_claim)
+        claimed, streak, xp_reward, aura_reward = await claim_daily(
+            uid, lambda s: (compute_daily_xp(s), compute_daily_aura(s))
+        )
+
+        if not claimed:
+            row = await get_user(uid, ("last_streak_claim",))
+            last_claim = int(row[0] or 0) if row else 0
+            remaining = max(0, 86400 - (int(time.time()) - last_claim))
             hrs = remaining // 3600
             mins = (remaining % 3600) // 60
             await ctx.reply(f"🈲 The samurai's blessing has already been taken today. Return in {hrs}h {mins}m to continue your streak.")
             return
 
-        streak = streak + 1 if last_claim != 0 and (now - last_claim) <= 172800 else 1
-        xp_reward = compute_daily_xp(streak)
-        aura_reward = compute_daily_aura(streak)
-
-        async with aiosqlite.connect(DB_PATH) as db:
-            await db.execute("INSERT OR IGNORE INTO users(user_id) VALUES(?)", (uid,))
-            await db.execute("UPDATE users SET xp = xp + ?, aura = aura + ?, streak_count = ?, last_streak_claim = ? WHERE user_id = ?",
-                             (xp_reward, aura_reward, streak, now, uid))
-            await db.commit()
-
-        self._profile_cache.pop(uid, None)
+        self._invalidate_profile(uid)
 
         embed = discord.Embed(title="Daily Claim — Samurai's Blessing", color=discord.Color.orange())
         embed.add_field(name="User", value=ctx.author.mention, inline=True)
@@ -219,9 +261,7 @@ class LevelCog(commands.Cog):
     # ---- leaderboard ----
     @commands.command(name="leaderboard", aliases=["lb", "top"])
     async def leaderboard(self, ctx: commands.Context):
-        async with aiosqlite.connect(DB_PATH) as db:
-            cur = await db.execute("SELECT user_id, xp, level FROM users ORDER BY level DESC, xp DESC LIMIT 10")
-            rows = await cur.fetchall()
+        rows = await get_leaderboard_page(limit=10)
         if not rows:
             return await ctx.reply("No leaderboard data.")
         lines = []
@@ -230,25 +270,31 @@ class LevelCog(commands.Cog):
                 uid = int(r[0])
             except Exception:
                 uid = None
-            lvl = int(r[2] or 0)
-            xp = int(r[1] or 0)
+            lvl = int(r[1] or 0)
+            xp = int(r[2] or 0)
             member = ctx.guild.get_member(uid) if uid else None
             name = member.display_name if member else f"User {r[0]}"
             lines.append(f"**#{i}** {name} — Level {lvl} • {format_big(xp)} XP")
         await ctx.reply("\n".join(lines))
 
     # ---- admin commands (setxp, setlevel, lvlup, synclevels, exportcsv) ----
+    async def _set_xp_level(self, uid: str, xp: int, level: int):
+        """Overwrite a user's xp/level; buffered XP is dropped so the next flush can't add to it."""
+        entry = self._pending.pop(uid, None)
+        messages = entry[1] if entry else 0  # the buffered message count still counts
+        async with transaction() as db:
+            await db.execute("INSERT OR IGNORE INTO users(user_id) VALUES(?)", (uid,))
+            await db.execute("UPDATE users SET xp = ?, level = ?, messages = messages + ? WHERE user_id = ?",
+                             (xp, level, messages, uid))
+        self._invalidate_profile(uid)
+
     @commands.command(name="setxp")
     @commands.has_permissions(administrator=True)
     async def setxp(self, ctx: commands.Context, member: discord.Member, xp: int):
         if xp < 0:
             return await ctx.reply("XP must be >= 0.")
         level = xp_to_level(xp)
-        async with aiosqlite.connect(DB_PATH) as db:
-            await db.execute("INSERT OR IGNORE INTO users(user_id) VALUES(?)", (str(member.id),))
-            await db.execute("UPDATE users SET xp = ?, level = ? WHERE user_id = ?", (xp, level, str(member.id)))
-            await db.commit()
-        self._profile_cache.pop(str(member.id), None)
+        await self._set_xp_level(str(member.id), xp, level)
         await ctx.reply(f"Set {member.display_name}'s XP to {xp} (Level {level}).")
 
     @commands.command(name="setlevel")
@@ -257,15 +303,15 @@ class LevelCog(commands.Cog):
         if level < 1:
             return await ctx.reply("Level must be >= 1.")
         xp = level_to_min_xp(level)
-        async with aiosqlite.connect(DB_PATH) as db:
-            await db.execute("INSERT OR IGNORE INTO users(user_id) VALUES(?)", (str(member.id),))
-            await db.execute("UPDATE users SET xp = ?, level = ? WHERE user_id = ?", (xp, level, str(member.id)))
-            await db.commit()
-        self._profile_cache.pop(str(member.id), None)
+        await self._set_xp_level(str(member.id), xp, level)
         await ctx.reply(f"Set {member.display_name}'s Level to {level} ({xp} XP).")
 
     async def cog_unload(self):
-        self._profile_cache.clear()
+        # let the loop finish its current flush and exit instead of cancelling it mid-write
+        self._closing = True
+        self._flush_now.set()
+        await self._flush_task
+        await self._flush_xp()
         self._msg_cd.clear()
         logger.info("LevelCog unloading — cleared caches.")
 
@@ -14,32 +14,54 @@ Features:
 
 import asyncio
 import time
-import re
-from typing import Optional, List, Tuple
+from typing import Dict, Iterable, Optional, List, Tuple
 from datetime import datetime, timedelta, timezone
 
-import aiosqlite
 import discord
 from discord.ext import commands
 
+from database import get_read_conn, transaction
 from logger import logger
 
 # ---------------- CONFIG ----------------
-DB_PATH = "database.db"
 LOG_CHANNEL_ID = 1177896378085679145  # Mod-log channel ID
-MUTE_CHECK_INTERVAL = 10  # Seconds
+EMBED_DESCRIPTION_LIMIT = 4096  # Discord's max embed description length
+LOG_BATCH_SIZE = 10  # Discord's max embeds per message
+LOG_BATCH_CHARS = 6000  # Discord's max total embed characters per message
+MUTE_CHECK_INTERVAL = 10  # Seconds, first retry delay after a failed monitor pass
+MUTE_MAX_BACKOFF = 60  # Seconds, cap for the doubling retry delay
+
+# Duration units in the order they must appear: unit -> (rank, seconds)
+_DURATION_UNITS = {"d": (0, 86400), "h": (1, 3600), "m": (2, 60)}
+
+# ---------------- SQL ----------------
+# Shared constants so sqlite3's statement cache sees the same string on every call
+SQL_EXPIRED_MUTES = "SELECT guild_id, user_id FROM mutes WHERE end_time IS NOT NULL AND end_time <= ?"
+SQL_DELETE_MUTE = "DELETE FROM mutes WHERE guild_id=? AND user_id=?"
+SQL_NEXT_EXPIRY = "SELECT MIN(end_time) FROM mutes WHERE end_time IS NOT NULL"
+SQL_UPSERT_MUTE = "INSERT OR REPLACE INTO mutes (guild_id,user_id,end_time,reason) VALUES(?,?,?,?)"
+SQL_INSERT_WARNING = "INSERT INTO warnings (guild_id,user_id,moderator_id,reason,timestamp) VALUES(?,?,?,?,?)"
+SQL_LIST_WARNINGS = "SELECT id, moderator_id, reason, timestamp FROM warnings WHERE guild_id=? AND user_id=? ORDER BY timestamp DESC"
+SQL_GET_WARNING = "SELECT id,guild_id FROM warnings WHERE id=?"
+SQL_DELETE_WARNING = "DELETE FROM warnings WHERE id=?"
 
 # ---------------- Cog ----------------
 class Moderation(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        self._mute_changed = asyncio.Event()  # set when a mute may expire earlier than _next_expiry
+        self._next_expiry: Optional[int] = None
+        self._bot_top_role_cache: Dict[int, int] = {}  # guild_id -> bot's top role position
+        self._log_q: "asyncio.Queue[discord.Embed]" = asyncio.Queue()
+        self._log_task = self.bot.loop.create_task(self._log_flusher())
         self._bg_task = self.bot.loop.create_task(self._init_db_and_restore())
         logger.info("[MOD] Moderation cog initializing...")
 
     # ---------------- DB setup & restore ----------------
     async def _init_db_and_restore(self):
         try:
-            async with aiosqlite.connect(DB_PATH) as db:
+            # the shared write connection from database.py, same as every other cog
+            async with transaction() as db:
                 await db.execute("""
                     CREATE TABLE IF NOT EXISTS warnings (
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -59,7 +81,9 @@ class Moderation(commands.Cog):
                         PRIMARY KEY (guild_id, user_id)
                     )
                 """)
-                await db.commit()
+                await db.execute("CREATE INDEX IF NOT EXISTS idx_warnings_guild_user_ts ON warnings(guild_id, user_id, timestamp DESC)")
+                # partial index: the monitor only ever scans timed mutes
+                await db.execute("CREATE INDEX IF NOT EXISTS idx_mutes_end_time ON mutes(end_time) WHERE end_time IS NOT NULL")
             logger.info("[MOD] DB initialized")
 
             # Start background mute monitor
@@ -73,80 +97,197 @@ class Moderation(commands.Cog):
         """Parse durations like '1d2h30m', '2h', '45m' → return seconds"""
         if not s:
             return None
-        s = s.replace(" ", "").lower()
-        pattern = r"(?:(\d+)d)?(?:(\d+)h)?(?:(\d+)m)?$"
-        m = re.match(pattern, s)
-        if not m:
+        total = 0
+        num = None
+        last_rank = -1
+        for ch in s.lower():
+            if ch == " ":
+                continue
+            if "0" <= ch <= "9":
+                num = (num or 0) * 10 + (ord(ch) - 48)
+                continue
+            unit = _DURATION_UNITS.get(ch)
+            # unknown unit, unit without digits, or units out of d/h/m order
+            if unit is None or num is None or unit[0] <= last_rank:
+                return None
+            last_rank, mult = unit
+            total += num * mult
+            num = None
+        if num is not None:  # trailing digits without a unit
             return None
-        days = int(m.group(1)) if m.group(1) else 0
-        hours = int(m.group(2)) if m.group(2) else 0
-        mins = int(m.group(3)) if m.group(3) else 0
-        total = days*86400 + hours*3600 + mins*60
         return total if total > 0 else None
 
-    async def _log_embed(self, guild: discord.Guild, title: str, description: str, fields: Optional[List[Tuple[str,str,bool]]] = None):
-        """Send an embed to LOG_CHANNEL_ID"""
+    async def _describe_users(self, user_ids: Iterable[int]) -> Dict[int, str]:
+        """Map each unique user id to 'name (id)', fetching only cache misses, in parallel"""
+        described: Dict[int, str] = {}
+        missing: List[int] = []
+        for uid in set(user_ids):
+            user = self.bot.get_user(uid)
+            if user:
+                described[uid] = f"{user} ({uid})"
+            else:
+                missing.append(uid)
+        if missing:
+            fetched = await asyncio.gather(*(self.bot.fetch_user(uid) for uid in missing), return_exceptions=True)
+            for uid, user in zip(missing, fetched):
+                described[uid] = str(uid) if isinstance(user, BaseException) else f"{user} ({uid})"
+        return described
+
+    def _log_embed(self, guild: discord.Guild, title: str, description: str, fields: Optional[List[Tuple[str,str,bool]]] = None):
+        """Queue an embed for LOG_CHANNEL_ID; _log_flusher sends it"""
         embed = discord.Embed(title=title, description=description, color=discord.Color.blurple(), timestamp=discord.utils.utcnow())
         if fields:
             for name, value, inline in fields:
                 embed.add_field(name=name, value=value, inline=inline)
         embed.set_footer(text=f"Server: {guild.name} • ID: {guild.id}")
+        self._log_q.put_nowait(embed)
+
+    @staticmethod
+    def _chunk_log_embeds(embeds: List[discord.Embed]) -> List[List[discord.Embed]]:
+        """Split embeds into messages within both LOG_BATCH_SIZE and LOG_BATCH_CHARS"""
+        batches: List[List[discord.Embed]] = []
+        batch: List[discord.Embed] = []
+        chars = 0
+        for embed in embeds:
+            size = len(embed)
+            if batch and (len(batch) >= LOG_BATCH_SIZE or chars + size > LOG_BATCH_CHARS):
+                batches.append(batch)
+                batch, chars = [], 0
+            batch.append(embed)
+            chars += size
+        if batch:
+            batches.append(batch)
+        return batches
+
+    async def _send_log_batch(self, batch: List[discord.Embed]):
+        log_channel = self.bot.get_channel(LOG_CHANNEL_ID)
+        if not log_channel:
+            logger.warning("[MOD] LOG_CHANNEL_ID not found or inaccessible")
+            for embed in batch:
+                logger.info("[MOD LOG] %s: %s", embed.title, embed.description)
+            return
         try:
-            log_channel = self.bot.get_channel(LOG_CHANNEL_ID)
-            if log_channel:
-                await log_channel.send(embed=embed)
-            else:
-                logger.warning("[MOD] LOG_CHANNEL_ID not found or inaccessible")
-                logger.info("[MOD LOG] %s: %s", title, description)
+            await log_channel.send(embeds=batch)
+            return
         except Exception as e:
-            logger.exception("[MOD] Failed to send log embed: %s", e)
+            if len(batch) == 1:
+                logger.exception("[MOD] Failed to send log embed: %s", e)
+                return
+            logger.warning("[MOD] Batched log send failed (%s); sending embeds one at a time", e)
+        # the audit trail matters more than the message count
+        for embed in batch:
+            try:
+                await log_channel.send(embed=embed)
+            except Exception as e:
+                logger.exception("[MOD] Failed to send log embed %r: %s", embed.title, e)
+
+    async def _send_log_embeds(self, embeds: List[discord.Embed]):
+        for batch in self._chunk_log_embeds(embeds):
+            await self._send_log_batch(batch)
+
+    async def _log_flusher(self):
+        """Send queued log embeds, batched within Discord's per-message limits"""
+        try:
+            while True:
+                embeds = [await self._log_q.get()]
+                while True:
+                    try:
+                        embeds.append(self._log_q.get_nowait())
+                    except asyncio.QueueEmpty:
+                        break
+                await self._send_log_embeds(embeds)
+        except asyncio.CancelledError:
+            logger.info("[MOD] Log flusher cancelled")
 
     # ---------------- Background mute monitor ----------------
     async def _mute_monitor_loop(self):
-        """Auto-unmute expired mutes"""
+        """Auto-unmute expired mutes, sleeping until the earliest pending expiry"""
+        failures = 0
         try:
             while True:
                 try:
-                    now = int(time.time())
-                    async with aiosqlite.connect(DB_PATH) as db:
-                        cur = await db.execute("SELECT guild_id, user_id FROM mutes WHERE end_time IS NOT NULL AND end_time <= ?", (now,))
-                        rows = await cur.fetchall()
-                    for guild_id, user_id in rows:
-                        guild = self.bot.get_guild(guild_id)
-                        if not guild:
-                            async with aiosqlite.connect(DB_PATH) as db:
-                                await db.execute("DELETE FROM mutes WHERE guild_id=? AND user_id=?", (guild_id, user_id))
-                                await db.commit()
-                            continue
-                        member = guild.get_member(user_id)
-                        if member:
-                            try:
-                                await member.edit(timeout=None)
-                                await self._log_embed(guild, "Auto Unmute", f"Automatically unmuted {member.mention} (mute expired).")
-                                logger.info("[MOD] Auto-unmuted %s in guild %s", user_id, guild_id)
-                            except Exception as exc:
-                                logger.exception("[MOD] Auto-unmute failed: %s", exc)
-                        async with aiosqlite.connect(DB_PATH) as db:
-                            await db.execute("DELETE FROM mutes WHERE guild_id=? AND user_id=?", (guild_id, user_id))
-                            await db.commit()
+                    await self._tick_once()
                 except Exception:
-                    logger.exception("[MOD] Error in mute monitor loop")
-                await asyncio.sleep(MUTE_CHECK_INTERVAL)
+                    failures += 1
+                    logger.exception("[MOD] Mute monitor tick failed (%d in a row)", failures)
+                    # back off so a broken DB doesn't spin the loop
+                    await asyncio.sleep(min(MUTE_MAX_BACKOFF, MUTE_CHECK_INTERVAL * 2 ** (failures - 1)))
+                    continue
+                failures = 0
+                await self._wait_for_next_expiry()
         except asyncio.CancelledError:
             logger.info("[MOD] Mute monitor loop cancelled")
+            raise
+
+    async def _tick_once(self):
+        """Lift every expired mute and refresh _next_expiry"""
+        now = int(time.time())
+        db = await get_read_conn()
+        cur = await db.execute(SQL_EXPIRED_MUTES, (now,))
+        rows = await cur.fetchall()
+        to_delete: List[Tuple[int, int]] = []
+        for guild_id, user_id in rows:
+            to_delete.append((guild_id, user_id))
+            guild = self.bot.get_guild(guild_id)
+            if not guild:
+                continue
+            member = guild.get_member(user_id)
+            if member:
+                try:
+                    await member.edit(timeout=None)
+                    self._log_embed(guild, "Auto Unmute", f"Automatically unmuted {member.mention} (mute expired).")
+                    logger.info("[MOD] Auto-unmuted %s in guild %s", user_id, guild_id)
+                except Exception as exc:
+                    logger.exception("[MOD] Auto-unmute failed: %s", exc)
+        # one transaction for every expired mute in this tick
+        if to_delete:
+            async with transaction() as wdb:
+                await wdb.executemany(SQL_DELETE_MUTE, to_delete)
+        cur = await db.execute(SQL_NEXT_EXPIRY)
+        row = await cur.fetchone()
+        self._next_expiry = row[0] if row else None
+
+    async def _wait_for_next_expiry(self):
+        # no pending timed mutes -> wait until mute() signals a new one
+        delay = max(0, self._next_expiry - int(time.time())) if self._next_expiry is not None else None
+        try:
+            await asyncio.wait_for(self._mute_changed.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+        self._mute_changed.clear()
 
     # ---------------- Safety ----------------
+    def _bot_top_position(self, guild: discord.Guild) -> int:
+        pos = self._bot_top_role_cache.get(guild.id)
+        if pos is None:
+            pos = self._bot_top_role_cache[guild.id] = guild.me.top_role.position
+        return pos
+
     def _can_act_on(self, moderator: discord.Member, target: discord.Member) -> Tuple[bool,str]:
         """Return (allowed, reason)"""
-        bot_member = moderator.guild.me
         if target == moderator:
             return False, "You cannot act on yourself."
-        if target.top_role >= moderator.top_role:
+        target_pos = target.top_role.position
+        if target_pos >= moderator.top_role.position:
             return False, "Cannot act on someone with equal/higher role."
-        if target.top_role >= bot_member.top_role:
+        if target_pos >= self._bot_top_position(moderator.guild):
             return False, "Cannot act due to bot role hierarchy."
         return True, ""
 
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        if after.id == self.bot.user.id:
+            self._bot_top_role_cache.pop(after.guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        # a reorder can move the bot's top role without touching its member object
+        self._bot_top_role_cache.pop(after.guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        self._bot_top_role_cache.pop(role.guild.id, None)
+
     # ---------------- Commands ----------------
     @commands.command(name="kick")
     @commands.has_permissions(kick_members=True)
@@ -156,7 +297,7 @@ class Moderation(commands.Cog):
         try:
             await member.kick(reason=reason)
             await ctx.send(f"✅ Kicked {member.mention} | Reason: {reason}")
-            await self._log_embed(ctx.guild, "Member Kicked", f"{ctx.author.mention} kicked {member.mention}.", [("Reason", reason, False)])
+            self._log_embed(ctx.guild, "Member Kicked", f"{ctx.author.mention} kicked {member.mention}.", [("Reason", reason, False)])
             logger.info("[MOD] Kicked %s in guild %s by %s", member.id, ctx.guild.id, ctx.author.id)
         except discord.Forbidden:
             await ctx.send("⚠ Bot lacks permission.")
@@ -172,7 +313,7 @@ class Moderation(commands.Cog):
         try:
             await member.ban(reason=reason)
             await ctx.send(f"✅ Banned {member.mention} | Reason: {reason}")
-            await self._log_embed(ctx.guild, "Member Banned", f"{ctx.author.mention} banned {member.mention}.", [("Reason", reason, False)])
+            self._log_embed(ctx.guild, "Member Banned", f"{ctx.author.mention} banned {member.mention}.", [("Reason", reason, False)])
             logger.info("[MOD] Banned %s in guild %s by %s", member.id, ctx.guild.id, ctx.author.id)
         except discord.Forbidden:
             await ctx.send("⚠ Bot lacks permission.")
@@ -187,7 +328,7 @@ class Moderation(commands.Cog):
             user = await self.bot.fetch_user(user_id)
             await ctx.guild.unban(user)
             await ctx.send(f"✅ Unbanned {user.mention}")
-            await self._log_embed(ctx.guild, "Member Unbanned", f"{ctx.author.mention} unbanned {user.mention}.")
+            self._log_embed(ctx.guild, "Member Unbanned", f"{ctx.author.mention} unbanned {user.mention}.")
         except discord.NotFound:
             await ctx.send("⚠ User not found in ban list.")
         except discord.Forbidden:
@@ -213,12 +354,12 @@ class Moderation(commands.Cog):
             await ctx.send(f"🔇 {member.mention} {human} | Reason: {reason}")
     
             # persist mute
-            async with aiosqlite.connect(DB_PATH) as db:
-                await db.execute("INSERT OR REPLACE INTO mutes (guild_id,user_id,end_time,reason) VALUES(?,?,?,?)",
-                                 (ctx.guild.id, member.id, db_end_time, reason))
-                await db.commit()
+            async with transaction() as db:
+                await db.execute(SQL_UPSERT_MUTE, (ctx.guild.id, member.id, db_end_time, reason))
+            if db_end_time and (self._next_expiry is None or db_end_time < self._next_expiry):
+                self._mute_changed.set()
     
-            await self._log_embed(ctx.guild, "Member Muted", f"{ctx.author.mention} muted {member.mention}.", [("Duration", human, False), ("Reason", reason, False)])
+            self._log_embed(ctx.guild, "Member Muted", f"{ctx.author.mention} muted {member.mention}.", [("Duration", human, False), ("Reason", reason, False)])
             logger.info("[MOD] Muted %s in guild %s by %s (duration=%s)", member.id, ctx.guild.id, ctx.author.id, duration)
         except discord.Forbidden:
             await ctx.send("⚠ Bot lacks permission to mute.")
@@ -238,13 +379,12 @@ class Moderation(commands.Cog):
             await member.edit(communication_disabled_until=None)
     
             # Remove from database
-            async with aiosqlite.connect(DB_PATH) as db:
-                await db.execute("DELETE FROM mutes WHERE guild_id=? AND user_id=?", (ctx.guild.id, member.id))
-                await db.commit()
+            async with transaction() as db:
+                await db.execute(SQL_DELETE_MUTE, (ctx.guild.id, member.id))
     
             # Send feedback & log
             await ctx.send(f"🔊 Unmuted {member.mention}")
-            await self._log_embed(ctx.guild, "Member Unmuted", f"{ctx.author.mention} unmuted {member.mention}.")
+            self._log_embed(ctx.guild, "Member Unmuted", f"{ctx.author.mention} unmuted {member.mention}.")
             logger.info("[MOD] Unmuted %s in guild %s by %s", member.id, ctx.guild.id, ctx.author.id)
     
         except discord.Forbidden:
@@ -260,9 +400,14 @@ class Moderation(commands.Cog):
         if amount < 1: return await ctx.send("⚠ Provide a number > 0.")
         amount = min(amount, 1000)
         try:
-            deleted = await ctx.channel.purge(limit=amount)
-            await ctx.send(f"🧹 Deleted {len(deleted)} messages.", delete_after=6)
-            await self._log_embed(ctx.guild, "Messages Purged", f"{ctx.author.mention} purged {len(deleted)} messages in {ctx.channel.mention}.")
+            # before= keeps the command message out of the purge so it can carry the reaction;
+            # purge bulk-deletes anything under 14 days old and falls back to single deletes otherwise
+            deleted = await ctx.channel.purge(limit=amount, before=ctx.message, bulk=True)
+            try:
+                await ctx.message.add_reaction("🧹")
+            except discord.HTTPException:
+                pass
+            self._log_embed(ctx.guild, "Messages Purged", f"{ctx.author.mention} purged {len(deleted)} messages in {ctx.channel.mention}.")
         except discord.Forbidden:
             await ctx.send("⚠ Bot lacks permission to delete messages.")
         except Exception as e:
@@ -275,49 +420,66 @@ class Moderation(commands.Cog):
         allowed, msg = self._can_act_on(ctx.author, member)
         if not allowed: return await ctx.send(f"⚠ {msg}")
         ts = int(time.time())
-        async with aiosqlite.connect(DB_PATH) as db:
-            cur = await db.execute("INSERT INTO warnings (guild_id,user_id,moderator_id,reason,timestamp) VALUES(?,?,?,?,?)",
-                                   (ctx.guild.id, member.id, ctx.author.id, reason, ts))
-            warn_id = cur.lastrowid
-            await db.commit()
+        async with transaction() as db:
+            cur = await db.execute(SQL_INSERT_WARNING, (ctx.guild.id, member.id, ctx.author.id, reason, ts))
+        warn_id = cur.lastrowid
         await ctx.send(f"⚠ Warned {member.mention} (case #{warn_id}) | Reason: {reason}")
-        await self._log_embed(ctx.guild, "User Warned", f"{ctx.author.mention} warned {member.mention}.", [("Case", str(warn_id), True), ("Reason", reason, False)])
+        self._log_embed(ctx.guild, "User Warned", f"{ctx.author.mention} warned {member.mention}.", [("Case", str(warn_id), True), ("Reason", reason, False)])
 
     @commands.command(name="warnings")
     @commands.has_permissions(kick_members=True)
     async def warnings(self, ctx: commands.Context, member: discord.Member):
-        async with aiosqlite.connect(DB_PATH) as db:
-            cur = await db.execute("SELECT id, moderator_id, reason, timestamp FROM warnings WHERE guild_id=? AND user_id=? ORDER BY timestamp DESC", (ctx.guild.id, member.id))
-            rows = await cur.fetchall()
+        db = await get_read_conn()
+        cur = await db.execute(SQL_LIST_WARNINGS, (ctx.guild.id, member.id))
+        rows = await cur.fetchall()
         if not rows: return await ctx.send(f"No warnings for {member.mention}.")
-        embed = discord.Embed(title=f"Warnings for {member}", color=discord.Color.orange())
-        for wid, mod_id, reason, ts in rows:
-            try: mod = await self.bot.fetch_user(mod_id); mod_repr = f"{mod} ({mod_id})"
-            except: mod_repr = str(mod_id)
-            embed.add_field(name=f"Case #{wid}", value=f"By: {mod_repr}\nReason: {reason}\nAt: <t:{ts}:F>", inline=False)
-        await ctx.send(embed=embed)
+        mod_map = await self._describe_users(r[1] for r in rows)
+        lines = [f"**Case #{wid}** • by {mod_map[mod_id]} • <t:{ts}:R>\n{reason}" for wid, mod_id, reason, ts in rows]
+        # one description per embed, split at the 4096-char limit
+        pages: List[str] = []
+        current = ""
+        for line in lines:
+            if current and len(current) + 2 + len(line) > EMBED_DESCRIPTION_LIMIT:
+                pages.append(current)
+                current = ""
+            current = f"{current}\n\n{line}" if current else line[:EMBED_DESCRIPTION_LIMIT]
+        pages.append(current)
+        for i, page in enumerate(pages):
+            title = f"Warnings for {member}" if i == 0 else None
+            await ctx.send(embed=discord.Embed(title=title, description=page, color=discord.Color.orange()))
 
     @commands.command(name="delwarn")
     @commands.has_permissions(kick_members=True)
     async def delwarn(self, ctx: commands.Context, case_id: int):
-        async with aiosqlite.connect(DB_PATH) as db:
-            cur = await db.execute("SELECT id,guild_id FROM warnings WHERE id=?", (case_id,))
-            row = await cur.fetchone()
-            if not row: return await ctx.send("Case not found.")
-            if row[1] != ctx.guild.id: return await ctx.send("Case not in this server.")
-            await db.execute("DELETE FROM warnings WHERE id=?", (case_id,))
-            await db.commit()
+        db = await get_read_conn()
+        cur = await db.execute(SQL_GET_WARNING, (case_id,))
+        row = await cur.fetchone()
+        if not row: return await ctx.send("Case not found.")
+        if row[1] != ctx.guild.id: return await ctx.send("Case not in this server.")
+        async with transaction() as db:
+            await db.execute(SQL_DELETE_WARNING, (case_id,))
         await ctx.send(f"✅ Deleted warning case #{case_id}.")
-        await self._log_embed(ctx.guild, "Warning Removed", f"{ctx.author.mention} removed warning case #{case_id}.")
+        self._log_embed(ctx.guild, "Warning Removed", f"{ctx.author.mention} removed warning case #{case_id}.")
 
     # ---------------- Lifecycle ----------------
     async def cog_load(self):
+        # commands need the warnings/mutes tables, so wait for them before registering
+        await self._bg_task
         logger.info("[MOD] Moderation cog loaded.")
 
     async def cog_unload(self):
         try:
             if hasattr(self, "_mute_task"):
                 self._mute_task.cancel()
+            self._log_task.cancel()
+            # send whatever the flusher had not picked up yet
+            pending = []
+            while not self._log_q.empty():
+                pending.append(self._log_q.get_nowait())
+            await self._send_log_embeds(pending)
+            # the shared connection itself is closed by bot.py's shutdown()
+            async with transaction() as db:
+                await db.execute("PRAGMA optimize")
             logger.info("[MOD] Moderation cog unloaded.")
         except Exception:
             logger.exception("[MOD] Error unloading moderation cog")
@@ -11,46 +11,53 @@ Features:
 import discord
 from discord.ext import commands
 from logger import logger
-from database import get_user, add_user
+from database import get_user, get_or_create_user
+from collections import OrderedDict
 import time
 
 # Progress bar characters
 PROGRESS_FILLED = "█"
 PROGRESS_EMPTY = "░"
 PROGRESS_WIDTH = 18
+# Every possible bar, indexed by number of filled cells
+_BAR_CACHE = tuple(PROGRESS_FILLED * i + PROGRESS_EMPTY * (PROGRESS_WIDTH - i) for i in range(PROGRESS_WIDTH + 1))
+
+PROFILE_COLOR = discord.Color.teal()
+
+# Rendered profile embeds kept at most this many users (LRU)
+PROFILE_CACHE_MAX = 1024
+# users columns the profile shows
+_STAT_COLUMNS = ("xp", "level", "messages", "aura", "streak_count")
 
 class Profile(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self._profile_cache = {}  # uid -> (expiry, embed/file)
+        self._profile_cache = OrderedDict()  # uid -> (expiry, embed), LRU order
         self.CACHE_TTL = 30
         logger.info("[PROFILE] Profile cog initialized.")
 
-    async def _ensure_user_exists(self, user_id: str):
-        """Ensure the user has a DB row."""
-        try:
-            await add_user(user_id)
-        except Exception as e:
-            logger.exception("Failed to ensure user exists: %s", e)
+    def invalidate(self, user_id: str):
+        """Drop a cached profile embed; called by LevelCog whenever the user's stats change."""
+        self._profile_cache.pop(user_id, None)
 
     async def _get_user_stats(self, user_id: str):
         """Fetch user XP, level, aura, streak, messages from DB."""
-        row = await get_user(user_id)
+        # plain read first; only a missing row needs the write transaction
+        row = await get_user(user_id, _STAT_COLUMNS) or await get_or_create_user(user_id)
         if not row:
             return None
-        # user_id, xp, level, messages, aura, streak_count, last_streak_claim
+        # by name: the projection and get_or_create_user's full row have different layouts
         return {
-            "xp": int(row[1] or 0),
-            "level": int(row[2] or 1),
-            "messages": int(row[3] or 0),
-            "aura": int(row[4] or 0),
-            "streak": int(row[5] or 0)
+            "xp": int(row["xp"] or 0),
+            "level": int(row["level"] or 1),
+            "messages": int(row["messages"] or 0),
+            "aura": int(row["aura"] or 0),
+            "streak": int(row["streak_count"] or 0)
         }
 
-    def _progress_bar(self, frac: float) -> str:
-        filled = int(round(frac * PROGRESS_WIDTH))
-        empty = PROGRESS_WIDTH - filled
-        return f"{PROGRESS_FILLED * filled}{PROGRESS_EMPTY * empty} {int(frac * 100)}%"
+    @staticmethod
+    def _progress_bar(frac: float) -> str:
+        return f"{_BAR_CACHE[int(round(frac * PROGRESS_WIDTH))]} {int(frac * 100)}%"
 
     def _calc_progress(self, xp: int, level: int) -> float:
         """Return fraction progress to next level."""
@@ -70,13 +77,13 @@ class Profile(commands.Cog):
         member = member or ctx.author
         uid = str(member.id)
 
-        # Check cache
+        # Serve from cache before touching the DB
         cached = self._profile_cache.get(uid)
         if cached and cached[0] > time.time():
+            self._profile_cache.move_to_end(uid)
             await ctx.send(embed=cached[1])
             return
 
-        await self._ensure_user_exists(uid)
         stats = await self._get_user_stats(uid)
         if not stats:
             return await ctx.send("⚠ No profile found. Try chatting first to create a profile.")
@@ -86,13 +93,10 @@ class Profile(commands.Cog):
 
         embed = discord.Embed(
             title=f"🌌 {member.display_name}'s Realm Profile",
-            color=discord.Color.teal()
+            color=PROFILE_COLOR
         )
-
-        try:
-            embed.set_thumbnail(url=member.display_avatar.url)
-        except:
-            pass
+        # display_avatar falls back to the default avatar, never None
+        embed.set_thumbnail(url=member.display_avatar.url)
 
         embed.add_field(name="⭐ Level", value=f"```{stats['level']}```", inline=True)
         embed.add_field(name="🔥 XP", value=f"```{stats['xp']}```", inline=True)
@@ -102,10 +106,13 @@ class Profile(commands.Cog):
         embed.add_field(name="Progress to next level", value=progress_bar, inline=False)
 
         embed.set_footer(text=f"🌙 Merlin Royz Profile | ID: {uid}")
-        embed.set_author(name=self.bot.user.name, icon_url=getattr(self.bot.user.avatar, "url", None))
+        embed.set_author(name=self.bot.user.name, icon_url=self.bot.user.display_avatar.url)
 
-        # Cache for 30s
+        # Cache for 30s (or until LevelCog invalidates it)
         self._profile_cache[uid] = (time.time() + self.CACHE_TTL, embed)
+        self._profile_cache.move_to_end(uid)
+        if len(self._profile_cache) > PROFILE_CACHE_MAX:
+            self._profile_cache.popitem(last=False)
 
         await ctx.send(embed=embed)
         logger.info("Sent profile for %s (%s)", member.display_name, uid)
@@ -22,8 +22,10 @@ Commands:
     /setprice
 """
 
-import re
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from itertools import islice
+from types import MappingProxyType
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Tuple
 
 import discord
 from discord.ext import commands
@@ -34,104 +36,140 @@ from database import add_skin_report, vote_skin, get_top_reports, remove_skin_re
 # ---------------------------
 # Config
 # ---------------------------
-ALLOWED_ROLE_IDS = {1259587539212173375, 1401443966011969686, 1205431837732900904}
+ALLOWED_ROLE_IDS = frozenset({1259587539212173375, 1401443966011969686, 1205431837732900904})
 SKINS_PER_PAGE = 6
-_IMAGE_RE = re.compile(r"^https?://.*\.(?:png|jpg|jpeg|webp|gif)$", re.IGNORECASE)
 
 # ============================
 # Currency Emoji
 # ============================
 GOLD = "<:gold:1445844021242232984>"
 
-SKINS: Dict[str, Dict[str, object]] = {
-    "Cosmo STREAM CRATE": {
-        "price": 42.00, "image_url": "https://i.postimg.cc/7LDZv1Cf/1000240574.png",
-        "rarity": "Common", "category": "Case",
-    },
-    "PawPaw STREAM CRATE": {
-        "price": 22.40, "image_url": "https://i.postimg.cc/nMbt4ZBT/1000240575.png",
-        "rarity": "Common", "category": "Case",
-    },
-    "Ultimate 8 YEAR GIFT CASE": {
-        "price": 2466.00, "image_url": "https://i.postimg.cc/x89CKvQC/1000240567.png",
-        "rarity": "Nameless", "category": "Case",
-    },
-    "Prime 8 YEAR GIFT CASE": {
-        "price": 73.99, "image_url": "https://i.postimg.cc/rF399sdd/1000240568.png",
-        "rarity": "Nameless", "category": "Case",
-    },
-    "Great 8 YEAR GIFT CASE": {
-        "price": 36.39, "image_url": "https://i.postimg.cc/PJNmWnTN/1000240569.png",
-        "rarity": "Nameless", "category": "Case",
-    },
-    "Syndicate WEAPON CRATE": {
-        "price": 12.38, "image_url": "https://i.postimg.cc/N0CgV3RJ/1000240576.png",
-        "rarity": "Common", "category": "Case",
-    },
-    "Prey WEAPON BOX": {
-        "price": 18.38, "image_url": "https://i.postimg.cc/5yWpsvCg/1000240595.png",
-        "rarity": "Common", "category": "Case",
-    },
-    "Gambit WEAPON BOX": {
-        "price": 29.54, "image_url": "https://i.postimg.cc/nzGQtQWj/1000240596.png",
-        "rarity": "Common", "category": "Case",
-    },
-    "Nightmare WEAPON BOX": {
-        "price": 39.92, "image_url": "https://i.postimg.cc/4dVQHdSh/1000240597.png",
-        "rarity": "Common", "category": "Case",
-    },
-    "Kitsune Dreams WEAPON BOX": {
-        "price": 38.00, "image_url": "https://i.postimg.cc/XqZ3kR94/1000240598.png",
-        "rarity": "Common", "category": "Case",
-    },
+class Skin(NamedTuple):
+    price: float
+    image_url: Optional[str]
+    rarity: str
+    category: str
+
+_SKINS_RAW: Dict[str, Skin] = {
+    "Cosmo STREAM CRATE": Skin(
+        price=42.00, image_url="https://i.postimg.cc/7LDZv1Cf/1000240574.png",
+        rarity="Common", category="Case",
+    ),
+    "PawPaw STREAM CRATE": Skin(
+        price=22.40, image_url="https://i.postimg.cc/nMbt4ZBT/1000240575.png",
+        rarity="Common", category="Case",
+    ),
+    "Ultimate 8 YEAR GIFT CASE": Skin(
+        price=2466.00, image_url="https://i.postimg.cc/x89CKvQC/1000240567.png",
+        rarity="Nameless", category="Case",
+    ),
+    "Prime 8 YEAR GIFT CASE": Skin(
+        price=73.99, image_url="https://i.postimg.cc/rF399sdd/1000240568.png",
+        rarity="Nameless", category="Case",
+    ),
+    "Great 8 YEAR GIFT CASE": Skin(
+        price=36.39, image_url="https://i.postimg.cc/PJNmWnTN/1000240569.png",
+        rarity="Nameless", category="Case",
+    ),
+    "Syndicate WEAPON CRATE": Skin(
+        price=12.38, image_url="https://i.postimg.cc/N0CgV3RJ/1000240576.png",
+        rarity="Common", category="Case",
+    ),
+    "Prey WEAPON BOX": Skin(
+        price=18.38, image_url="https://i.postimg.cc/5yWpsvCg/1000240595.png",
+        rarity="Common", category="Case",
+    ),
+    "Gambit WEAPON BOX": Skin(
+        price=29.54, image_url="https://i.postimg.cc/nzGQtQWj/1000240596.png",
+        rarity="Common", category="Case",
+    ),
+    "Nightmare WEAPON BOX": Skin(
+        price=39.92, image_url="https://i.postimg.cc/4dVQHdSh/1000240597.png",
+        rarity="Common", category="Case",
+    ),
+    "Kitsune Dreams WEAPON BOX": Skin(
+        price=38.00, image_url="https://i.postimg.cc/XqZ3kR94/1000240598.png",
+        rarity="Common", category="Case",
+    ),
 }
+# Read-only view for the rest of the module; only !setprice writes, through _SKINS_RAW
+SKINS: Mapping[str, Skin] = MappingProxyType(_SKINS_RAW)
 
 # ---------------------------
 # Helper functions
 # ---------------------------
 def normalize_name(name: str) -> str:
-    return name.strip().lower()
+    return name.strip().casefold()
+
+# Normalized names computed once; SKINS keys never change at runtime (setprice only edits values)
+_NORMALIZED: Dict[str, str] = {k: normalize_name(k) for k in SKINS}
+_BY_NORMALIZED: Dict[str, str] = {n: k for k, n in _NORMALIZED.items()}
+# UTF-8 encoded for substring search; byte search is valid since UTF-8 never splits a match
+_CF_KEYS: Tuple[Tuple[bytes, str], ...] = tuple((n.encode(), k) for k, n in _NORMALIZED.items())
 
 def find_skin_by_name(name: str) -> Optional[str]:
-    target = normalize_name(name)
-    for key in SKINS.keys():
-        if normalize_name(key) == target:
-            return key
-    return None
+    return _BY_NORMALIZED.get(normalize_name(name))
+
+@lru_cache(maxsize=512)
+def _match_keys(t: bytes) -> Tuple[str, ...]:
+    # keys never change at runtime, so a term's matches stay valid for the process lifetime
+    return tuple(k for b, k in _CF_KEYS if t in b)
 
 def find_partial_matches(term: str, limit: int = 10) -> List[str]:
-    t = normalize_name(term)
-    return [k for k in SKINS.keys() if t in normalize_name(k)][:limit]
+    if limit <= 0:
+        return []
+    return list(_match_keys(normalize_name(term).encode())[:limit])
+
+_RARITY_COLORS = {
+    "common": 0x95A5A6,
+    "uncommon": 0x2ECC71,
+    "rare": 0x3498DB,
+    "epic": 0x9B59B6,
+    "legendary": 0xE67E22,
+    "nameless": 0xffac21,
+}
+# Rarity never changes at runtime, so each skin's embed color is resolved once
+_SKIN_COLORS: Dict[str, int] = {
+    k: _RARITY_COLORS.get(d.rarity.lower(), 0x5865F2) for k, d in SKINS.items()
+}
+
+_PRICE_FOOTER = "Standoff 2 • Skin Prices NOTE: Skins prices gets updated everyday its not automatic and does not show real time price"
+_LIST_FOOTER = "Use buttons or /listskins <page> to navigate"
+# GOLD is baked in once instead of being interpolated on every render
+_PRICE_DESC_TMPL = "🟡 **Price:** `{p} " + GOLD + "`\n⭐ **Rarity:** `{r}`\n📦 **Category:** `{c}`"
+_LIST_FIELD_TMPL = "💰 {p} " + GOLD + " • ⭐ {r} • 📦 {c}"
+
+# Static part of every price embed
+_PRICE_EMBED_TPL = {
+    "type": "rich",
+    "footer": {"text": _PRICE_FOOTER},
+}
 
 def build_price_embed(skin_name: str) -> discord.Embed:
-    data = SKINS[skin_name]
-    price = data.get("price", 0)
-    rarity = data.get("rarity", "Unknown")
-    category = data.get("category", "Misc")
-    image = data.get("image_url")
-
-    rarity_colors = {
-        "common": 0x95A5A6,
-        "uncommon": 0x2ECC71,
-        "rare": 0x3498DB,
-        "epic": 0x9B59B6,
-        "legendary": 0xE67E22,
-        "nameless": 0xffac21,
+    price, image, rarity, category = SKINS[skin_name]
+    color = _SKIN_COLORS[skin_name]
+
+    # build the whole payload, then one from_dict instead of Embed() + setters
+    payload = {
+        **_PRICE_EMBED_TPL,
+        "title": skin_name,
+        "description": _PRICE_DESC_TMPL.format(p=price, r=rarity, c=category),
+        "color": color,
     }
-    color = rarity_colors.get(rarity.lower(), 0x5865F2)
-
-    # use f-string correctly and show GOLD emoji
-    embed = discord.Embed(
-        title=f"{skin_name}",
-        description=f"🟡 **Price:** `{price} {GOLD}`\n⭐ **Rarity:** `{rarity}`\n📦 **Category:** `{category}`",
-        color=color,
-    )
     if image:
-        embed.set_image(url=image)
-    embed.set_footer(text="Standoff 2 • Skin Prices NOTE: Skins prices gets updated everyday its not automatic and does not show real time price")
+        payload["image"] = {"url": image}
+    return discord.Embed.from_dict(payload)
+
+# Rendered price embeds by canonical skin name; entries dropped by !setprice
+_PRICE_EMBED_CACHE: Dict[str, discord.Embed] = {}
+
+def get_price_embed(skin_name: str) -> discord.Embed:
+    embed = _PRICE_EMBED_CACHE.get(skin_name)
+    if embed is None:
+        embed = _PRICE_EMBED_CACHE[skin_name] = build_price_embed(skin_name)
     return embed
 
-def build_list_page_embed(page_items: List[Tuple[str, Dict]], page: int, total_pages: int) -> discord.Embed:
+def build_list_page_embed(page_items: List[Tuple[str, Skin]], page: int, total_pages: int) -> discord.Embed:
     embed = discord.Embed(
         title="Standoff 2 Market — Skins",
         description=f"Page {page}/{total_pages} • {len(SKINS)} total skins",
@@ -140,95 +178,98 @@ def build_list_page_embed(page_items: List[Tuple[str, Dict]], page: int, total_p
     for name, data in page_items:
         embed.add_field(
             name=name,
-            value=f"💰 {data.get('price',0)} {GOLD} • ⭐ {data.get('rarity','Unknown')} • 📦 {data.get('category','Misc')}",
+            value=_LIST_FIELD_TMPL.format(p=data.price, r=data.rarity, c=data.category),
             inline=False
         )
-    embed.set_footer(text="Use buttons or /listskins <page> to navigate")
+    embed.set_footer(text=_LIST_FOOTER)
     return embed
 
-def chunk_list(items: List[Tuple[str, Dict]], chunk_size: int) -> List[List[Tuple[str, Dict]]]:
-    return [items[i:i+chunk_size] for i in range(0, len(items), chunk_size)]
+def chunk_list(items: Iterable[Tuple[str, Skin]], chunk_size: int) -> Iterator[List[Tuple[str, Skin]]]:
+    it = iter(items)
+    while batch := list(islice(it, chunk_size)):
+        yield batch
 
 def user_has_edit_role(member: discord.Member) -> bool:
-    return any(role.id in ALLOWED_ROLE_IDS for role in getattr(member, "roles", []))
+    if not ALLOWED_ROLE_IDS:
+        return False
+    roles = getattr(member, "roles", None)
+    return bool(roles) and not ALLOWED_ROLE_IDS.isdisjoint(role.id for role in roles)
 
 # ---------------------------
 # Paginator
 # ---------------------------
+@lru_cache(maxsize=256)
+def _page_label(index: int, n_pages: int) -> str:
+    # shared by every open paginator, so each label string is built once
+    return f"Page {index + 1}/{n_pages}"
+
 class MarketPaginator(discord.ui.View):
-    def __init__(self, pages: List[discord.Embed], author_id: Optional[int] = None, timeout: int = 180):
+    def __init__(self, get_page: Callable[[int], discord.Embed], n_pages: int, author_id: Optional[int] = None, timeout: int = 180, index: int = 0):
         super().__init__(timeout=timeout)
-        self.pages = pages
+        # pages live on the cog; the view only tracks its position
+        self.get_page = get_page
+        self.n_pages = n_pages
         self.author_id = author_id
-        self.index = 0
+        self.index = index
+        self.page_info.label = self.page_label()
+
+    def page_label(self) -> str:
+        return _page_label(self.index, self.n_pages)
 
-        self.prev_btn = discord.ui.Button(label="◀ Prev", style=discord.ButtonStyle.primary)
-        self.next_btn = discord.ui.Button(label="Next ▶", style=discord.ButtonStyle.primary)
-        self.first_btn = discord.ui.Button(label="|<<", style=discord.ButtonStyle.secondary)
-        self.last_btn = discord.ui.Button(label=">>|", style=discord.ButtonStyle.secondary)
-        self.page_info = discord.ui.Button(label=self.page_label(), style=discord.ButtonStyle.secondary, disabled=True)
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        # runs once before any button callback
+        if self.author_id is not None and interaction.user.id != self.author_id:
+            await interaction.response.send_message("Only author can control.", ephemeral=True)
+            return False
+        return True
 
-        self.prev_btn.callback = self._prev
-        self.next_btn.callback = self._next
-        self.first_btn.callback = self._first
-        self.last_btn.callback = self._last
+    async def _go(self, interaction: discord.Interaction, index: int):
+        self.index = index % self.n_pages
+        self.page_info.label = self.page_label()
+        await interaction.response.edit_message(embed=self.get_page(self.index), view=self)
 
-        self.add_item(self.first_btn)
-        self.add_item(self.prev_btn)
-        self.add_item(self.page_info)
-        self.add_item(self.next_btn)
-        self.add_item(self.last_btn)
+    # Buttons are declared on the class; discord.py copies them per view, in this order
+    @discord.ui.button(label="|<<", style=discord.ButtonStyle.secondary)
+    async def first_btn(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._go(interaction, 0)
 
-    def page_label(self) -> str:
-        return f"Page {self.index + 1}/{len(self.pages)}"
+    @discord.ui.button(label="◀ Prev", style=discord.ButtonStyle.primary)
+    async def prev_btn(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._go(interaction, self.index - 1)
 
-    async def _update(self, interaction: discord.Interaction):
-        self.page_info.label = self.page_label()
-        await interaction.response.edit_message(embed=self.pages[self.index], view=self)
-
-    async def _prev(self, interaction: discord.Interaction):
-        if self.author_id and interaction.user.id != self.author_id:
-            return await interaction.response.send_message("Only author can control.", ephemeral=True)
-        self.index = (self.index - 1) % len(self.pages)
-        await self._update(interaction)
-
-    async def _next(self, interaction: discord.Interaction):
-        if self.author_id and interaction.user.id != self.author_id:
-            return await interaction.response.send_message("Only author can control.", ephemeral=True)
-        self.index = (self.index + 1) % len(self.pages)
-        await self._update(interaction)
-
-    async def _first(self, interaction: discord.Interaction):
-        if self.author_id and interaction.user.id != self.author_id:
-            return await interaction.response.send_message("Only author can control.", ephemeral=True)
-        self.index = 0
-        await self._update(interaction)
-
-    async def _last(self, interaction: discord.Interaction):
-        if self.author_id and interaction.user.id != self.author_id:
-            return await interaction.response.send_message("Only author can control.", ephemeral=True)
-        self.index = len(self.pages) - 1
-        await self._update(interaction)
+    @discord.ui.button(label="Page", style=discord.ButtonStyle.secondary, disabled=True)
+    async def page_info(self, interaction: discord.Interaction, button: discord.ui.Button):
+        pass  # disabled indicator, never clicked
+
+    @discord.ui.button(label="Next ▶", style=discord.ButtonStyle.primary)
+    async def next_btn(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._go(interaction, self.index + 1)
+
+    @discord.ui.button(label=">>|", style=discord.ButtonStyle.secondary)
+    async def last_btn(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._go(interaction, -1)
 
 # ==========================
 # UPDATED PRICE SELECT (Dropdown)
 # ==========================
+# Options only show rarity/category, which never change, so they are built once
+_SKIN_SELECT_OPTIONS = [
+    discord.SelectOption(label=name, description=f"{SKINS[name].rarity} • {SKINS[name].category}")
+    for name in islice(SKINS, 25)  # keep to 25 to avoid hitting Discord limit
+]
+
 class SkinSelect(discord.ui.Select):
     def __init__(self):
-        options = [
-            discord.SelectOption(label=name, description=f"{SKINS[name]['rarity']} • {SKINS[name]['category']}")
-            for name in list(SKINS.keys())[:25]  # keep to 25 to avoid hitting Discord limit
-        ]
         super().__init__(
             placeholder="Select a skin to view price...",
             min_values=1,
             max_values=1,
-            options=options
+            options=list(_SKIN_SELECT_OPTIONS)  # copy so the shared options are never mutated
         )
 
     async def callback(self, interaction: discord.Interaction):
         skin_name = self.values[0]
-        await interaction.response.edit_message(embed=build_price_embed(skin_name), view=None)
+        await interaction.response.edit_message(embed=get_price_embed(skin_name), view=None)
 
 class SkinSelectView(discord.ui.View):
     def __init__(self):
@@ -242,6 +283,16 @@ class SO2MarketCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self._sorted_items = sorted(SKINS.items(), key=lambda kv: kv[0].lower())
+        self._embed_pages_cache: List[discord.Embed] = self._build_list_pages()
+
+    def _build_list_pages(self) -> List[discord.Embed]:
+        """Render every !listskins page; rebuilt only when a price changes."""
+        total_pages = max(1, -(-len(self._sorted_items) // SKINS_PER_PAGE))
+        return [build_list_page_embed(chunk, i+1, total_pages)
+                for i, chunk in enumerate(chunk_list(self._sorted_items, SKINS_PER_PAGE))]
+
+    def _get_list_page(self, index: int) -> discord.Embed:
+        return self._embed_pages_cache[index]
 
     # -----------------------
     # Prefix commands
@@ -256,26 +307,26 @@ class SO2MarketCog(commands.Cog):
             matches = find_partial_matches(name, limit=6)
             if not matches:
                 return await ctx.send(f"❌ No skin found matching `{name}`")
-            lines = [f"- {m} ({SKINS[m]['price']} {GOLD})" for m in matches]
+            lines = [f"- {m} ({SKINS[m].price} {GOLD})" for m in matches]
             return await ctx.send(f"❌ Did you mean:\n" + "\n".join(lines))
-        await ctx.send(embed=build_price_embed(key))
+        await ctx.send(embed=get_price_embed(key))
 
     @commands.command(name="listskins", aliases=["skins"])
     async def lists_cmd(self, ctx: commands.Context, page: Optional[int] = 1):
-        items = self._sorted_items
-        pages = chunk_list(items, SKINS_PER_PAGE)
-        total_pages = max(1, len(pages))
-        page_index = min(max(page - 1, 0), total_pages - 1)
-        embed_pages = [build_list_page_embed(chunk, i+1, total_pages) for i, chunk in enumerate(pages)]
-        paginator = MarketPaginator(embed_pages, author_id=ctx.author.id)
-        await ctx.send(embed=embed_pages[page_index], view=paginator)
+        n_pages = len(self._embed_pages_cache)
+        page_index = min(max(page - 1, 0), n_pages - 1)
+        paginator = MarketPaginator(self._get_list_page, n_pages, author_id=ctx.author.id, index=page_index)
+        await ctx.send(embed=self._get_list_page(page_index), view=paginator)
 
     @commands.command(name="findskin")
     async def find_cmd(self, ctx: commands.Context, *, query: str):
         matches = find_partial_matches(query, limit=20)
         if not matches:
             return await ctx.send(f"❌ No skins matching `{query}`")
-        lines = [f"- **{m}** — {SKINS[m]['price']} {GOLD} • {SKINS[m]['rarity']}" for m in matches]
+        lines = []
+        for m in matches:
+            d = SKINS[m]
+            lines.append(f"- **{m}** — {d.price} {GOLD} • {d.rarity}")
         await ctx.send("🔎 Matches:\n" + "\n".join(lines))
 
     @commands.command(name="setprice")
@@ -285,9 +336,12 @@ class SO2MarketCog(commands.Cog):
         key = find_skin_by_name(skin_name)
         if not key:
             return await ctx.send(f"❌ Skin `{skin_name}` not found.")
-        old = SKINS[key]["price"]
-        SKINS[key]["price"] = price
-        self._sorted_items = sorted(SKINS.items(), key=lambda kv: kv[0].lower())
+        old = SKINS[key].price
+        _SKINS_RAW[key] = SKINS[key]._replace(price=price)
+        # names didn't change, so swap in the new entries without re-sorting
+        self._sorted_items = [(k, SKINS[k]) for k, _ in self._sorted_items]
+        _PRICE_EMBED_CACHE.pop(key, None)
+        self._embed_pages_cache = self._build_list_pages()
         embed = discord.Embed(title="✅ Price Updated", color=discord.Color.green())
         embed.add_field(name="Skin", value=key, inline=True)
         embed.add_field(name="Old Price", value=str(old) + f" {GOLD}", inline=True)
@@ -335,7 +389,6 @@ class SO2MarketCog(commands.Cog):
         if not user_has_edit_role(ctx.author):
             return await ctx.send("❌ You don't have permission.")
 
-        key = find_skin_by_name(skin_name)  # optional: check if already in SKINS
         await remove_skin_report(skin_name)
         await ctx.send(f"✅ `{skin_name}` has been removed from the vote list.")
 
@@ -10,57 +10,120 @@ Includes debug logging.
 import discord
 from discord.ext import commands
 import aiosqlite
+import asyncio
 import time
+from typing import Dict, List
 from logger import logger
-from database import DB_PATH, add_user
+from database import get_read_conn, transaction
 
 # Default leaderboard limit
 LEADERBOARD_LIMIT = 10
+STATS_FIELDS = ("messages", "commands", "reactions")
+STATS_FLUSH_INTERVAL = 5  # seconds between batched stat writes
+STATS_FLUSH_MAX_PENDING = 200  # flush early once this many users are pending
+LEADERBOARD_CACHE_TTL = 30  # seconds a top-N result is reused
+
+# One fixed SQL string per filter so sqlite3's statement cache reuses the prepared query
+_LB_SQL = {f: f"SELECT user_id, {f} FROM stats ORDER BY {f} DESC LIMIT ?" for f in STATS_FIELDS}
 
 class StatsTracker(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        self._known: set = set()  # user_ids that already have users + stats rows
+        self._pending: Dict[str, List[int]] = {}  # uid -> [messages, commands, reactions]
+        self._flush_now = asyncio.Event()
+        self._closing = False
+        self._lb_cache: Dict[str, tuple] = {}  # filter -> (expiry, rows)
+        self._flush_task = self.bot.loop.create_task(self._stats_flush_loop())
         logger.info("[STATS] StatsTracker cog initialized.")
 
     # ----------------------
     # Internal DB helpers
     # ----------------------
+    async def _load_known(self):
+        """Remember which users already have a stats row (table is created by init_db)."""
+        db = await get_read_conn()
+        cur = await db.execute("SELECT user_id FROM stats")
+        self._known.update(r[0] for r in await cur.fetchall())
+        logger.info("[STATS] %s known users loaded.", len(self._known))
+
+    async def _insert_user_rows(self, db: aiosqlite.Connection, user_id: str):
+        """Create the base users row and the stats row on an open connection (no commit)."""
+        await db.execute("INSERT OR IGNORE INTO users(user_id) VALUES(?)", (user_id,))
+        await db.execute("INSERT OR IGNORE INTO stats(user_id) VALUES(?)", (user_id,))
+
     async def _ensure_user_stats(self, user_id: str):
-        """Ensure user exists in DB with stats fields."""
+        """Ensure user exists in DB with stats fields (statsdebug only; flushes upsert)."""
+        if user_id in self._known:
+            return
         try:
-            await add_user(user_id)  # ensures base user row exists
-            async with aiosqlite.connect(DB_PATH) as db:
-                await db.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS stats (
-                        user_id TEXT PRIMARY KEY,
-                        messages INTEGER DEFAULT 0,
-                        commands INTEGER DEFAULT 0,
-                        reactions INTEGER DEFAULT 0
-                    )
-                    """
-                )
-                await db.execute(
-                    "INSERT OR IGNORE INTO stats(user_id) VALUES(?)",
-                    (user_id,)
-                )
-                await db.commit()
+            async with transaction() as db:
+                await self._insert_user_rows(db, user_id)
+            self._known.add(user_id)
         except Exception as e:
             logger.exception("[STATS] Failed to ensure stats row: %s", e)
 
-    async def _increment_stat(self, user_id: str, field: str, amount: int = 1):
-        """Increment a stat field for a user."""
+    def _increment_stat(self, user_id: str, field: str, amount: int = 1):
+        """Buffer an increment; written by _flush_stats in one transaction."""
+        entry = self._pending.get(user_id)
+        if entry is None:
+            entry = self._pending[user_id] = [0, 0, 0]
+        entry[STATS_FIELDS.index(field)] += amount
+        if len(self._pending) >= STATS_FLUSH_MAX_PENDING:
+            self._flush_now.set()
+
+    # ----------------------
+    # Batched writes
+    # ----------------------
+    async def _stats_flush_loop(self):
+        try:
+            # cog_unload sets _closing and wakes us, so a flush is never cut off mid-transaction
+            while not self._closing:
+                try:
+                    await asyncio.wait_for(self._flush_now.wait(), timeout=STATS_FLUSH_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                self._flush_now.clear()
+                await self._flush_stats()
+        except asyncio.CancelledError:
+            logger.info("[STATS] Flush loop cancelled.")
+            raise
+
+    def _requeue(self, pending: Dict[str, List[int]]):
+        """Merge an unwritten batch back into _pending so the counts are not lost."""
+        for uid, counts in pending.items():
+            entry = self._pending.setdefault(uid, [0, 0, 0])
+            for i, n in enumerate(counts):
+                entry[i] += n
+
+    async def _flush_stats(self):
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        new_users = [uid for uid in pending if uid not in self._known]
         try:
-            await self._ensure_user_stats(user_id)
-            async with aiosqlite.connect(DB_PATH) as db:
-                await db.execute(
-                    f"UPDATE stats SET {field} = {field} + ? WHERE user_id = ?",
-                    (amount, user_id)
+            # the upsert creates missing stats rows itself; only first sightings need a users row
+            async with transaction() as db:
+                if new_users:
+                    await db.executemany(
+                        "INSERT OR IGNORE INTO users(user_id) VALUES(?)", [(uid,) for uid in new_users]
+                    )
+                await db.executemany(
+                    "INSERT INTO stats(user_id, messages, commands, reactions) VALUES(?, ?, ?, ?) "
+                    "ON CONFLICT(user_id) DO UPDATE SET messages = messages + excluded.messages, "
+                    "commands = commands + excluded.commands, reactions = reactions + excluded.reactions",
+                    [(uid, m, c, r) for uid, (m, c, r) in pending.items()]
                 )
-                await db.commit()
-            logger.debug(f"[STATS] Incremented {field} for {user_id} by {amount}")
-        except Exception as e:
-            logger.exception(f"[STATS] Failed to increment {field} for {user_id}: {e}")
+        except asyncio.CancelledError:
+            # transaction() rolled back; keep the batch for the next flush
+            self._requeue(pending)
+            raise
+        except Exception:
+            logger.exception("[STATS] Failed to flush pending stats; will retry.")
+            self._requeue(pending)
+            return
+        self._known.update(new_users)
+        logger.debug("[STATS] Flushed stats for %s users", len(pending))
 
     # ----------------------
     # Listeners
@@ -69,19 +132,19 @@ class StatsTracker(commands.Cog):
     async def on_message(self, message: discord.Message):
         if message.author.bot or not message.guild:
             return
-        await self._increment_stat(str(message.author.id), "messages")
+        self._increment_stat(str(message.author.id), "messages")
 
     @commands.Cog.listener()
     async def on_reaction_add(self, reaction: discord.Reaction, user: discord.User):
         if user.bot or not reaction.message.guild:
             return
-        await self._increment_stat(str(user.id), "reactions")
+        self._increment_stat(str(user.id), "reactions")
 
     @commands.Cog.listener()
     async def on_command_completion(self, ctx: commands.Context):
         if ctx.author.bot:
             return
-        await self._increment_stat(str(ctx.author.id), "commands")
+        self._increment_stat(str(ctx.author.id), "commands")
 
     # ----------------------
     # Commands
@@ -93,15 +156,18 @@ class StatsTracker(commands.Cog):
     )
     async def stats_leaderboard(self, ctx: commands.Context, filter_type: str = "messages"):
         filter_type = filter_type.lower()
-        if filter_type not in ("messages", "commands", "reactions"):
+        if filter_type not in _LB_SQL:
             return await ctx.reply("Invalid filter! Use messages, commands, or reactions.")
 
-        async with aiosqlite.connect(DB_PATH) as db:
-            cur = await db.execute(
-                f"SELECT user_id, {filter_type} FROM stats ORDER BY {filter_type} DESC LIMIT ?",
-                (LEADERBOARD_LIMIT,)
-            )
-            rows = await cur.fetchall()
+        cached = self._lb_cache.get(filter_type)
+        if cached and cached[0] > time.time():
+            rows = cached[1]
+        else:
+            db = await get_read_conn()
+            cur = await db.execute(_LB_SQL[filter_type], (LEADERBOARD_LIMIT,))
+            # ids converted once here so cached hits skip it
+            rows = [(int(uid), count) for uid, count in await cur.fetchall()]
+            self._lb_cache[filter_type] = (time.time() + LEADERBOARD_CACHE_TTL, rows)
 
         if not rows:
             return await ctx.reply("No stats data available yet.")
@@ -111,10 +177,10 @@ class StatsTracker(commands.Cog):
             color=discord.Color.blue()
         )
 
+        get_member = ctx.guild.get_member
         lines = []
-        for i, row in enumerate(rows, start=1):
-            user_id, count = row
-            member = ctx.guild.get_member(int(user_id))
+        for i, (user_id, count) in enumerate(rows, start=1):
+            member = get_member(user_id)
             name = member.display_name if member else f"User {user_id}"
             lines.append(f"**#{i}** {name} — {count}")
 
@@ -128,19 +194,30 @@ class StatsTracker(commands.Cog):
     @commands.is_owner()
     async def stats_debug(self, ctx: commands.Context, member: discord.Member = None):
         member = member or ctx.author
+        await self._flush_stats()
         await self._ensure_user_stats(str(member.id))
-        async with aiosqlite.connect(DB_PATH) as db:
-            cur = await db.execute("SELECT * FROM stats WHERE user_id = ?", (str(member.id),))
-            row = await cur.fetchone()
-        await ctx.reply(f"**Stats Debug for {member.display_name}:** {row}")
+        db = await get_read_conn()
+        cur = await db.execute("SELECT * FROM stats WHERE user_id = ?", (str(member.id),))
+        row = await cur.fetchone()
+        await ctx.reply(f"**Stats Debug for {member.display_name}:** {dict(row) if row else None}")
 
     # ----------------------
     # Lifecycle
     # ----------------------
     async def cog_load(self):
+        try:
+            await self._load_known()
+        except Exception as e:
+            logger.exception("[STATS] Failed to load known stats users: %s", e)
         logger.info("[STATS] StatsTracker cog loaded.")
 
     async def cog_unload(self):
+        # let the loop finish its current flush and exit instead of cancelling it mid-write
+        self._closing = True
+        self._flush_now.set()
+        await self._flush_task
+        await self._flush_stats()
+        self._lb_cache.clear()
         logger.info("[STATS] StatsTracker cog unloaded.")
 
 # ----------------------
@@ -1,18 +1,137 @@
 # database.py
+import asyncio
 import aiosqlite
 import math
 import random
 import time
 import logging
-from typing import Optional, Tuple, List, Any
+from contextlib import asynccontextmanager
+from typing import Callable, Optional, Tuple, List, Dict, Iterable
 
-logger = logging.getLogger("database")
-if not logger.handlers:
-    logger.addHandler(logging.StreamHandler())
-logger.setLevel(logging.DEBUG)
+from logger import logger as _bot_logger
+
+# child of merlinRoyz: records go through its QueueHandler and follow its LOG_LEVEL
+logger = _bot_logger.getChild("database")
 
 DB_PATH = "database.db"
 
+# Applied to every shared connection right after it is opened
+DB_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",  # 64MB
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=5000",
+    # checkpoints are driven by checkpoint_wal_loop instead of landing on a random commit
+    "PRAGMA wal_autocheckpoint=10000",
+)
+WAL_CHECKPOINT_INTERVAL = 30  # seconds
+
+# -------------------------
+# Shared connection
+# -------------------------
+_conn: Optional[aiosqlite.Connection] = None
+_read_conn: Optional[aiosqlite.Connection] = None
+_conn_open_lock = asyncio.Lock()
+_write_lock = asyncio.Lock()
+
+async def _open_conn() -> aiosqlite.Connection:
+    # larger statement cache: helpers pass the same module-level SQL strings every call
+    conn = await aiosqlite.connect(DB_PATH, cached_statements=256)
+    # Row still indexes/unpacks like a tuple, and adds name access
+    conn.row_factory = aiosqlite.Row
+    for pragma in DB_PRAGMAS:
+        await conn.execute(pragma)
+    return conn
+
+async def get_conn() -> aiosqlite.Connection:
+    """
+    Return the process-wide write connection, opening it (with DB_PRAGMAS) on first use.
+    Writes go through transaction() so they never interleave.
+    """
+    global _conn
+    if _conn is None:
+        async with _conn_open_lock:
+            if _conn is None:
+                _conn = await _open_conn()
+                logger.debug("Shared connection opened on %s", DB_PATH)
+    return _conn
+
+async def get_read_conn() -> aiosqlite.Connection:
+    """
+    Return the process-wide read-only connection. Under WAL it reads the last
+    committed state without waiting on the writer's thread or transaction.
+    """
+    global _read_conn
+    if _read_conn is None:
+        # writer first so the database is already in WAL mode for the reader
+        await get_conn()
+        async with _conn_open_lock:
+            if _read_conn is None:
+                conn = await _open_conn()
+                await conn.execute("PRAGMA query_only=1")
+                _read_conn = conn
+                logger.debug("Shared read connection opened on %s", DB_PATH)
+    return _read_conn
+
+@asynccontextmanager
+async def transaction():
+    """Serialize a write on the shared connection; commit on success, roll back on error."""
+    db = await get_conn()
+    async with _write_lock:
+        # take SQLite's write lock up front: other connections (cogs with their own aiosqlite.connect) also write,
+        # and a deferred transaction upgrading from read to write can fail with SQLITE_BUSY
+        await db.execute("BEGIN IMMEDIATE")
+        try:
+            yield db
+        except BaseException:
+            await db.rollback()
+            raise
+        await db.commit()
+
+async def _wal_checkpoint(mode: str):
+    db = await get_conn()
+    # between our own transactions, never in the middle of one
+    async with _write_lock:
+        cur = await db.execute(f"PRAGMA wal_checkpoint({mode})")
+        busy, log_pages, done = await cur.fetchone()
+    if busy:
+        logger.warning("wal_checkpoint(%s) blocked: log=%s checkpointed=%s", mode, log_pages, done)
+    else:
+        logger.debug("wal_checkpoint(%s): log=%s checkpointed=%s", mode, log_pages, done)
+
+async def checkpoint_wal_loop(interval: int = WAL_CHECKPOINT_INTERVAL):
+    """
+    Background task: periodically fold the WAL back into the database.
+    PASSIVE never waits on readers or the busy handler, so writers queued on
+    _write_lock are not stalled; close_conn truncates the WAL at shutdown.
+    """
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await _wal_checkpoint("PASSIVE")
+            except Exception:
+                logger.exception("WAL checkpoint failed; will retry.")
+    except asyncio.CancelledError:
+        logger.info("WAL checkpoint loop cancelled.")
+
+async def close_conn():
+    global _conn, _read_conn
+    if _read_conn is not None:
+        await _read_conn.close()
+        _read_conn = None
+    if _conn is not None:
+        try:
+            # nothing else is writing now, so waiting on readers here costs nobody
+            await _wal_checkpoint("TRUNCATE")
+        except Exception:
+            logger.exception("Final WAL checkpoint failed.")
+        await _conn.close()
+        _conn = None
+        logger.debug("Shared connections closed")
+
 # -------------------------
 # Low-level helpers
 # -------------------------
@@ -20,31 +139,43 @@ async def _table_exists(db: aiosqlite.Connection, name: str) -> bool:
     cur = await db.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?", (name,))
     return (await cur.fetchone()) is not None
 
-async def _column_exists(db: aiosqlite.Connection, table: str, column: str) -> bool:
+async def _table_columns(db: aiosqlite.Connection, table: str) -> set:
     cur = await db.execute(f"PRAGMA table_info({table})")
-    rows = await cur.fetchall()
-    cols = [r[1] for r in rows]
-    return column in cols
+    return {r[1] for r in await cur.fetchall()}
 
 # -------------------------
 # Safe migration helper
 # -------------------------
+# Bumped whenever _ensure_users_columns gains a new step
+USERS_SCHEMA_VERSION = 2
+
+async def _set_schema_version(db: aiosqlite.Connection):
+    # PRAGMA values can't be bound as parameters
+    await db.execute(f"PRAGMA user_version = {USERS_SCHEMA_VERSION}")
+
 async def _ensure_users_columns(db: aiosqlite.Connection):
     """
     Ensure users table has final schema columns:
       user_id, xp, level, messages, aura, streak_count, last_streak_claim
     Attempts ALTER TABLE; on failure it will perform a safe copy migration.
+    Stamps PRAGMA user_version once done so later starts skip the column probe.
+    Runs inside init_db's transaction and never commits itself.
     """
+    cur = await db.execute("PRAGMA user_version")
+    if (await cur.fetchone())[0] >= USERS_SCHEMA_VERSION:
+        return
+
     # If users table doesn't exist, nothing to migrate here.
     if not await _table_exists(db, "users"):
         return
 
-    needed = []
-    for col, default in (("streak_count", "0"), ("last_streak_claim", "0")):
-        if not await _column_exists(db, "users", col):
-            needed.append((col, default))
+    # one table_info read covers every column check and the fallback below
+    existing_cols = await _table_columns(db, "users")
+    needed = [(col, default) for col, default in (("streak_count", "0"), ("last_streak_claim", "0"))
+              if col not in existing_cols]
 
     if not needed:
+        await _set_schema_version(db)
         return
 
     logger.info("DB migration: need to add columns %s", [c for c, _ in needed])
@@ -53,7 +184,7 @@ async def _ensure_users_columns(db: aiosqlite.Connection):
     try:
         for col, default in needed:
             await db.execute(f"ALTER TABLE users ADD COLUMN {col} INTEGER DEFAULT {default}")
-        await db.commit()
+        await _set_schema_version(db)
         logger.info("DB migration via ALTER TABLE succeeded.")
         return
     except Exception as e:
@@ -61,10 +192,6 @@ async def _ensure_users_columns(db: aiosqlite.Connection):
 
     # Fallback: safe copy table method
     try:
-        # Get current columns
-        cur = await db.execute("PRAGMA table_info(users)")
-        rows = await cur.fetchall()
-        existing_cols = [r[1] for r in rows]
         logger.debug("Existing users columns: %s", existing_cols)
 
         # New final schema
@@ -95,7 +222,7 @@ async def _ensure_users_columns(db: aiosqlite.Connection):
         await db.execute(f"INSERT INTO users_new ({insert_cols}) SELECT {select_list} FROM users")
         await db.execute("DROP TABLE users")
         await db.execute("ALTER TABLE users_new RENAME TO users")
-        await db.commit()
+        await _set_schema_version(db)
         logger.info("Safe copy migration succeeded.")
     except Exception:
         logger.exception("Safe copy migration failed.")
@@ -108,7 +235,9 @@ async def init_db():
     """
     Create tables if missing and run migrations to ensure final schema.
     """
-    async with aiosqlite.connect(DB_PATH) as db:
+    # the shared connection applies DB_PRAGMAS (WAL included) when it opens
+    async with transaction() as db:
+        # one transaction for all DDL and the migration: a failed start leaves the schema untouched
         # Users (final schema)
         await db.execute("""
             CREATE TABLE IF NOT EXISTS users (
@@ -144,9 +273,24 @@ async def init_db():
             )
         """)
 
-        await db.commit()
+        # per-user activity counters (StatsTracker)
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS stats (
+                user_id TEXT PRIMARY KEY,
+                messages INTEGER DEFAULT 0,
+                commands INTEGER DEFAULT 0,
+                reactions INTEGER DEFAULT 0
+            )
+        """)
+        # statsleaderboard orders by one of these columns
+        for col in ("messages", "commands", "reactions"):
+            await db.execute(f"CREATE INDEX IF NOT EXISTS idx_stats_{col} ON stats({col} DESC)")
+
         # ensure older DBs have the additional columns, using safe migration helper
         await _ensure_users_columns(db)
+        # after the migration, since a safe copy rebuilds the users table
+        # get_all_users and the !leaderboard query order by (level, xp)
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_users_level_xp ON users(level DESC, xp DESC)")
 
     logger.info("Database initialized and migrated if necessary.")
 
@@ -154,123 +298,192 @@ async def init_db():
 # User management helpers
 # -------------------------
 async def add_user(user_id: str) -> None:
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with transaction() as db:
         await db.execute("INSERT OR IGNORE INTO users(user_id) VALUES(?)", (user_id,))
-        await db.commit()
     logger.debug("add_user(%s)", user_id)
 
-async def get_user(user_id: str) -> Optional[aiosqlite.Row]:
-    async with aiosqlite.connect(DB_PATH) as db:
-        cur = await db.execute("SELECT * FROM users WHERE user_id = ?", (user_id,))
+USER_COLUMNS = ("user_id", "xp", "level", "messages", "aura", "streak_count", "last_streak_claim")
+# SELECT text per column projection, built once (identical strings keep the statement cache hot)
+_USER_SELECT_SQL: Dict[Tuple[str, ...], str] = {}
+
+def _user_select_sql(cols: Tuple[str, ...]) -> str:
+    sql = _USER_SELECT_SQL.get(cols)
+    if sql is None:
+        unknown = set(cols) - set(USER_COLUMNS)
+        if unknown:
+            raise ValueError(f"unknown users columns: {sorted(unknown)}")
+        sql = _USER_SELECT_SQL[cols] = f"SELECT {', '.join(cols)} FROM users WHERE user_id = ?"
+    return sql
+
+async def get_user(user_id: str, cols: Optional[Tuple[str, ...]] = None) -> Optional[aiosqlite.Row]:
+    """Return the user's row, or only `cols` of it (e.g. ("xp", "level"))."""
+    db = await get_read_conn()
+    if cols is not None:
+        cur = await db.execute(_user_select_sql(cols), (user_id,))
+        return await cur.fetchone()
+
+    cur = await db.execute("SELECT * FROM users WHERE user_id = ?", (user_id,))
+    row = await cur.fetchone()
+    if logger.isEnabledFor(logging.DEBUG):
+        # Row has no useful repr; only pay for the tuple copy when it is logged
+        logger.debug("get_user(%s) -> %s", user_id, tuple(row) if row else None)
+    return row
+
+async def get_or_create_user(user_id: str) -> aiosqlite.Row:
+    """Insert the user if missing and return their full row in a single statement."""
+    async with transaction() as db:
+        cur = await db.execute(
+            "INSERT INTO users(user_id) VALUES(?) "
+            "ON CONFLICT(user_id) DO UPDATE SET user_id = excluded.user_id "
+            "RETURNING *",
+            (user_id,),
+        )
         row = await cur.fetchone()
-    logger.debug("get_user(%s) -> %s", user_id, row)
+        await cur.close()
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("get_or_create_user(%s) -> %s", user_id, tuple(row) if row else None)
     return row
 
 async def get_all_users(limit: int = 1000) -> List[aiosqlite.Row]:
-    async with aiosqlite.connect(DB_PATH) as db:
-        cur = await db.execute("SELECT * FROM users ORDER BY level DESC, xp DESC LIMIT ?", (limit,))
-        rows = await cur.fetchall()
-    return rows
+    db = await get_read_conn()
+    cur = await db.execute("SELECT * FROM users ORDER BY level DESC, xp DESC LIMIT ?", (limit,))
+    return await cur.fetchall()
+
+async def get_leaderboard_page(after: Optional[Tuple[int, int, str]] = None, limit: int = 25) -> List[aiosqlite.Row]:
+    """
+    One page of (user_id, level, xp, aura) ordered by level, then xp.
+    Pass the (level, xp, user_id) of the previous page's last row as `after` for the next
+    page; the keyset seek keeps each page O(limit) instead of skipping over earlier rows.
+    """
+    db = await get_read_conn()
+    if after is None:
+        cur = await db.execute(
+            "SELECT user_id, level, xp, aura FROM users "
+            "ORDER BY level DESC, xp DESC, user_id DESC LIMIT ?",
+            (limit,),
+        )
+    else:
+        cur = await db.execute(
+            "SELECT user_id, level, xp, aura FROM users WHERE (level, xp, user_id) < (?, ?, ?) "
+            "ORDER BY level DESC, xp DESC, user_id DESC LIMIT ?",
+            (*after, limit),
+        )
+    return await cur.fetchall()
 
 # -------------------------
 # XP, level, aura logic
 # -------------------------
+# [lo, hi) aura ranges for levels 1-10, 11-20, 21-30 and everything else
+_AURA_TIERS = ((1, 101), (101, 301), (301, 501), (501, 1001))
+
 def random_aura_for_level(level: int) -> int:
-    if 1 <= level <= 10:
-        return random.randint(1, 100)
-    elif 11 <= level <= 20:
-        return random.randint(101, 300)
-    elif 21 <= level <= 30:
-        return random.randint(301, 500)
-    else:
-        return random.randint(501, 1000)
+    tier = (level - 1) // 10
+    lo, hi = _AURA_TIERS[tier if 0 <= tier < 3 else 3]
+    return random.randrange(lo, hi)
 
 async def modify_aura(user_id: str, amount: int) -> bool:
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with transaction() as db:
         cur = await db.execute("SELECT aura FROM users WHERE user_id = ?", (user_id,))
         row = await cur.fetchone()
         if not row:
             return False
         new_aura = max((row[0] or 0) + amount, 0)
         await db.execute("UPDATE users SET aura = ? WHERE user_id = ?", (new_aura, user_id))
-        await db.commit()
     logger.debug("modify_aura(%s, %s) -> %s", user_id, amount, new_aura)
     return True
 
+# create-or-bump in one statement and read back what the level check needs
+_SQL_APPLY_XP = """
+    INSERT INTO users(user_id, xp, messages) VALUES(?, ?, ?)
+    ON CONFLICT(user_id) DO UPDATE SET xp = xp + excluded.xp, messages = messages + excluded.messages
+    RETURNING xp, level, aura
+"""
+_SQL_SET_LEVEL_AURA = "UPDATE users SET level = ?, aura = ? WHERE user_id = ?"
+
+async def _apply_xp(db: aiosqlite.Connection, user_id: str, xp_gain: int, messages_gain: int) -> Tuple[int, int]:
+    """
+    Add xp/messages for one user on an open connection (no commit).
+    Recalculates level and adds aura on level up. Returns (old_level, new_level).
+    """
+    cur = await db.execute(_SQL_APPLY_XP, (user_id, xp_gain, messages_gain))
+    row = await cur.fetchone()
+    await cur.close()
+    if not row:
+        return 1, 1
+    xp, level, aura = row
+    new_level = math.isqrt(xp // 10) + 1
+    if new_level == level:
+        return level, new_level
+    if new_level > level:
+        gained_aura = random_aura_for_level(new_level)
+        aura = (aura or 0) + gained_aura
+        logger.info("update_user: level-up for %s %s -> %s (+%s aura)", user_id, level, new_level, gained_aura)
+    await db.execute(_SQL_SET_LEVEL_AURA, (new_level, aura, user_id))
+    return level, new_level
+
 async def update_user(user_id: str, xp_gain: int = 10):
     """
     Increase xp by xp_gain and messages by 1.
     Recalculate level and add aura on level up.
     """
-    async with aiosqlite.connect(DB_PATH) as db:
-        await db.execute("INSERT OR IGNORE INTO users(user_id) VALUES(?)", (user_id,))
-        await db.execute("""
-            UPDATE users
-            SET xp = xp + ?, messages = messages + 1
-            WHERE user_id = ?
-        """, (xp_gain, user_id))
+    async with transaction() as db:
+        await _apply_xp(db, user_id, xp_gain, 1)
 
-        cur = await db.execute("SELECT xp, level, aura FROM users WHERE user_id = ?", (user_id,))
-        row = await cur.fetchone()
-        if row:
-            xp, level, aura = row
-            new_level = int(math.sqrt(xp // 10)) + 1
-            if new_level > level:
-                gained_aura = random_aura_for_level(new_level)
-                aura = (aura or 0) + gained_aura
-                logger.info("update_user: level-up for %s %s -> %s (+%s aura)", user_id, level, new_level, gained_aura)
-            await db.execute("UPDATE users SET level = ?, aura = ? WHERE user_id = ?", (new_level, aura, user_id))
-
-        await db.commit()
+async def add_xp_batch(updates: Iterable[Tuple[str, int, int]]) -> List[Tuple[str, int, int]]:
+    """
+    Apply many (user_id, xp_gain, messages_gain) updates in a single transaction.
+    Same level/aura rules as update_user.
+    Returns (user_id, old_level, new_level) for every user that levelled up.
+    """
+    level_ups = []
+    async with transaction() as db:
+        for user_id, xp_gain, messages_gain in updates:
+            old_level, new_level = await _apply_xp(db, user_id, xp_gain, messages_gain)
+            if new_level > old_level:
+                level_ups.append((user_id, old_level, new_level))
+    logger.debug("add_xp_batch: %s level-ups", len(level_ups))
+    return level_ups
 
 # -------------------------
 # Daily streak logic (24h window)
 # -------------------------
-async def claim_daily(user_id: str, base_reward_xp: int = 50, base_reward_aura: int = 50) -> Tuple[bool, int, int, int]:
+# Streak after this claim: reset to 1 if the last claim is over 48h old, else +1
+_NEXT_STREAK = (
+    "CASE WHEN IFNULL(last_streak_claim, 0) != 0 AND :now - last_streak_claim > 172800 "
+    "THEN 1 ELSE IFNULL(streak_count, 0) + 1 END"
+)
+# 24h check and streak update in one statement; no row back means already claimed
+_SQL_CLAIM_DAILY = f"""
+    UPDATE users
+    SET streak_count = {_NEXT_STREAK},
+        last_streak_claim = :now
+    WHERE user_id = :uid AND :now - IFNULL(last_streak_claim, 0) >= 86400
+    RETURNING streak_count
+"""
+_SQL_DAILY_REWARD = "UPDATE users SET xp = xp + ?, aura = aura + ? WHERE user_id = ?"
+
+async def claim_daily(user_id: str, rewards: Callable[[int], Tuple[int, int]]) -> Tuple[bool, int, int, int]:
     """
-    Claims daily reward for `user_id`.
+    Claims daily reward for `user_id`; rewards(streak) gives the (xp, aura) to add.
     Returns tuple: (success_flag, streak_count, xp_reward, aura_reward)
     If already claimed within last 24h returns (False, streak_count, 0, 0)
     """
-    now = int(time.time())
-    async with aiosqlite.connect(DB_PATH) as db:
+    now = time.time_ns() // 1_000_000_000  # whole seconds without a float round-trip
+    # one BEGIN IMMEDIATE transaction, so two concurrent claims can't both pass the 24h check
+    async with transaction() as db:
         await db.execute("INSERT OR IGNORE INTO users(user_id) VALUES(?)", (user_id,))
-        cur = await db.execute("SELECT streak_count, last_streak_claim FROM users WHERE user_id = ?", (user_id,))
+        cur = await db.execute(_SQL_CLAIM_DAILY, {"now": now, "uid": user_id})
         row = await cur.fetchone()
-        if not row:
-            # shouldn't happen, but guard
-            streak = 0
-            last = 0
-        else:
-            streak = int(row[0] or 0)
-            last = int(row[1] or 0)
-
-        # Already claimed in last 24 hours?
-        if now - last < 86400:
-            return False, streak, 0, 0
-
-        # If last claim > 48h ago -> reset streak
-        if last != 0 and (now - last) > 172800:
-            streak = 1
-        else:
-            streak = streak + 1
-
-        # reward scaling: +10% per consecutive day (capped sensibly)
-        multiplier = 1.0 + 0.10 * (streak - 1)
-        if multiplier > 5.0:  # safety cap
-            multiplier = 5.0
-
-        xp_reward = int(base_reward_xp * multiplier)
-        aura_reward = int(base_reward_aura * multiplier)
+        await cur.close()
+        if row is None:
+            cur = await db.execute("SELECT streak_count FROM users WHERE user_id = ?", (user_id,))
+            row = await cur.fetchone()
+            return False, int(row[0] or 0) if row else 0, 0, 0
+        streak = int(row[0])
+        xp_reward, aura_reward = rewards(streak)
+        await db.execute(_SQL_DAILY_REWARD, (xp_reward, aura_reward, user_id))
 
-        await db.execute("""
-            UPDATE users
-            SET streak_count = ?, last_streak_claim = ?, xp = xp + ?, aura = aura + ?
-            WHERE user_id = ?
-        """, (streak, now, xp_reward, aura_reward, user_id))
-
-        await db.commit()
-        return True, streak, xp_reward, aura_reward
+    return True, streak, xp_reward, aura_reward
 
 # -------------------------
 # Skin reports & votes (Option 2 semantics)
@@ -281,15 +494,30 @@ async def add_skin_report(user_id: str, skin_name: str) -> bool:
     """
     skin_name = skin_name.strip()
     now = int(time.time())
-    async with aiosqlite.connect(DB_PATH) as db:
-        try:
+    try:
+        async with transaction() as db:
             await db.execute("INSERT INTO skin_reports (skin_name, user_id, created_at) VALUES (?, ?, ?)",
                              (skin_name, user_id, now))
-            await db.commit()
-            logger.debug("add_skin_report: %s by %s", skin_name, user_id)
-            return True
-        except aiosqlite.IntegrityError:
-            return False
+    except aiosqlite.IntegrityError:
+        return False
+    logger.debug("add_skin_report: %s by %s", skin_name, user_id)
+    return True
+
+async def add_skin_reports(reports: Iterable[Tuple[str, str]]) -> int:
+    """
+    Bulk version of add_skin_report for (user_id, skin_name) pairs, in one transaction.
+    Duplicates are skipped. Returns how many reports were added.
+    """
+    now = int(time.time())
+    async with transaction() as db:
+        before = db.total_changes
+        await db.executemany(
+            "INSERT OR IGNORE INTO skin_reports (skin_name, user_id, created_at) VALUES (?, ?, ?)",
+            [(skin_name.strip(), user_id, now) for user_id, skin_name in reports],
+        )
+        added = db.total_changes - before
+    logger.debug("add_skin_reports: %s added", added)
+    return added
 
 async def vote_skin(user_id: str, skin_name: str) -> bool:
     """
@@ -297,25 +525,23 @@ async def vote_skin(user_id: str, skin_name: str) -> bool:
     """
     skin_name = skin_name.strip()
     now = int(time.time())
-    async with aiosqlite.connect(DB_PATH) as db:
-        try:
+    try:
+        async with transaction() as db:
             await db.execute("INSERT INTO skin_votes (skin_name, user_id, created_at) VALUES (?, ?, ?)",
                              (skin_name, user_id, now))
-            await db.commit()
-            logger.debug("vote_skin: %s by %s", skin_name, user_id)
-            return True
-        except aiosqlite.IntegrityError:
-            return False
+    except aiosqlite.IntegrityError:
+        return False
+    logger.debug("vote_skin: %s by %s", skin_name, user_id)
+    return True
 
 async def remove_skin_report(skin_name: str) -> int:
     """
     Remove all reports for skin_name (string). Returns number of rows deleted.
     """
     skin_name = skin_name.strip()
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with transaction() as db:
         cur = await db.execute("DELETE FROM skin_reports WHERE skin_name = ?", (skin_name,))
-        await db.commit()
-        deleted = cur.rowcount if hasattr(cur, "rowcount") else 0
+    deleted = cur.rowcount if hasattr(cur, "rowcount") else 0
     logger.debug("remove_skin_report: %s deleted=%s", skin_name, deleted)
     return deleted
 
@@ -324,41 +550,31 @@ async def remove_skin_vote(user_id: str, skin_name: str) -> bool:
     Remove a single user's vote for a skin. Returns True if a row removed.
     """
     skin_name = skin_name.strip()
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with transaction() as db:
         cur = await db.execute("DELETE FROM skin_votes WHERE skin_name = ? AND user_id = ?", (skin_name, user_id))
-        await db.commit()
-        # cur.rowcount may not be reliable in aiosqlite; fetch presence instead
-        return True if cur.rowcount and cur.rowcount > 0 else False
+    # cur.rowcount may not be reliable in aiosqlite; fetch presence instead
+    return True if cur.rowcount and cur.rowcount > 0 else False
 
 async def get_top_reports(limit: int = 10) -> List[Tuple[str, int]]:
     """
     Return top skins by combined (reports + votes) count.
     Returns list of tuples: (skin_name, total_votes)
     """
-    async with aiosqlite.connect(DB_PATH) as db:
-        # Build a unified list of skin names from both tables, then aggregate counts
-        query = """
-        WITH names AS (
-            SELECT skin_name FROM skin_reports
-            UNION
-            SELECT skin_name FROM skin_votes
-        ),
-        r AS (
-            SELECT skin_name, COUNT(*) AS reports_count FROM skin_reports GROUP BY skin_name
-        ),
-        v AS (
-            SELECT skin_name, COUNT(*) AS votes_count FROM skin_votes GROUP BY skin_name
-        )
-        SELECT names.skin_name,
-               IFNULL(r.reports_count, 0) + IFNULL(v.votes_count, 0) AS total
-        FROM names
-        LEFT JOIN r ON r.skin_name = names.skin_name
-        LEFT JOIN v ON v.skin_name = names.skin_name
-        ORDER BY total DESC
-        LIMIT ?
-        """
-        cur = await db.execute(query, (limit,))
-        rows = await cur.fetchall()
+    db = await get_read_conn()
+    # One pass over each table; every row counts once toward its skin's total
+    query = """
+    SELECT skin_name, COUNT(*) AS total
+    FROM (
+        SELECT skin_name FROM skin_reports
+        UNION ALL
+        SELECT skin_name FROM skin_votes
+    )
+    GROUP BY skin_name
+    ORDER BY total DESC
+    LIMIT ?
+    """
+    cur = await db.execute(query, (limit,))
+    rows = await cur.fetchall()
     # rows are tuples (skin_name, total)
     return [(r[0], int(r[1])) for r in rows]
 
@@ -366,13 +582,11 @@ async def get_top_reports(limit: int = 10) -> List[Tuple[str, int]]:
 # Utility: remove skin vote/report helper (admin)
 # -------------------------
 async def clear_all_skin_reports():
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with transaction() as db:
         await db.execute("DELETE FROM skin_reports")
-        await db.commit()
     logger.debug("clear_all_skin_reports executed")
 
 async def clear_all_skin_votes():
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with transaction() as db:
         await db.execute("DELETE FROM skin_votes")
-        await db.commit()
     logger.debug("clear_all_skin_votes executed")
@@ -1,25 +1,64 @@
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
+
+# The formatter never prints thread/process info, so skip collecting it per record
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
 
 # Create a logger
 logger = logging.getLogger("merlinRoyz")
-logger.setLevel(logging.DEBUG)  # Track everything, DEBUG is the lowest level
+# INFO by default; LOG_LEVEL=DEBUG tracks everything
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# getLevelName maps a known name to its number; a typo must not stop the bot from starting
+_level = logging.getLevelName(LOG_LEVEL)
+logger.setLevel(_level if isinstance(_level, int) else logging.INFO)
 
 # Console handler
 ch = logging.StreamHandler()
 ch.setLevel(logging.DEBUG)
 
-# File handler
-fh = logging.FileHandler("bot_debug.log")
+# File handler: opened on first record, rotated so the debug log stays bounded
+fh = logging.handlers.RotatingFileHandler(
+    "bot_debug.log", maxBytes=5_000_000, backupCount=3, encoding="utf-8", delay=True
+)
 fh.setLevel(logging.DEBUG)
 
 # Formatter
-formatter = logging.Formatter(
+class CachedTimeFormatter(logging.Formatter):
+    """Formats asctime once per wall-clock second instead of once per record."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._last_second = None
+        self._last_asctime = ""
+
+    def formatTime(self, record, datefmt=None):
+        second = int(record.created)
+        if second != self._last_second:
+            # only the listener thread formats, so no lock is needed
+            self._last_second = second
+            self._last_asctime = super().formatTime(record, datefmt)
+        return self._last_asctime
+
+formatter = CachedTimeFormatter(
     "[%(asctime)s] [%(levelname)s] %(name)s: %(message)s",
     datefmt="%Y-%m-%d %H:%M:%S"
 )
 ch.setFormatter(formatter)
 fh.setFormatter(formatter)
 
+# Callers only enqueue the record; the listener thread does the console/file writes
+log_queue = queue.SimpleQueue()
+listener = logging.handlers.QueueListener(log_queue, ch, fh, respect_handler_level=True)
+listener.start()
+atexit.register(listener.stop)  # drain whatever is still queued on exit
+
 # Add handlers
-logger.addHandler(ch)
-logger.addHandler(fh)
+logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+if not isinstance(_level, int):
+    logger.warning("Unknown LOG_LEVEL %r; using INFO.", LOG_LEVEL)